@@ -8,8 +8,10 @@ for silky curves and the fabric Animator for graceful data transitions.
 import gi
 import cairo
 from gi.repository import Gtk, Pango, PangoCairo  # type: ignore
-from typing import Any, List, Optional, Tuple
-from functools import partial
+from collections import deque
+from typing import Any, Iterable, List, Optional, Tuple
+from functools import lru_cache, partial
+from itertools import islice
 from utils.animator import Animator, _cubic_bezier
 
 gi.require_version("Gtk", "3.0")
@@ -34,6 +36,31 @@ def _hex_to_rgba(hex_str: str) -> Tuple[float, float, float, float]:
 # ── Spline math ───────────────────────────────────────────────────────────────
 
 
+@lru_cache(maxsize=16)
+def _catmull_rom_basis(
+    tension: float, steps: int
+) -> Tuple[Tuple[float, float, float, float], ...]:
+    """Weights of p0..p3 for each of the *steps* + 1 samples of a segment.
+
+    They only depend on (tension, steps), so they are computed once and
+    every segment of every frame reduces to four multiply-adds per sample.
+    """
+    tau = 0.5 * (1.0 - tension)
+    weights = []
+    for i in range(steps + 1):
+        s = i / steps
+        s2, s3 = s * s, s * s * s
+        weights.append(
+            (
+                tau * (-s3 + 2 * s2 - s),
+                (2 * s3 - 3 * s2 + 1) + tau * (s3 - 2 * s2 + s),
+                (-2 * s3 + 3 * s2) + tau * (-s3 + s2),
+                tau * (s3 - s2),
+            )
+        )
+    return tuple(weights)
+
+
 def _catmull_rom_segment(
     p0: Tuple[float, float],
     p1: Tuple[float, float],
@@ -43,26 +70,68 @@ def _catmull_rom_segment(
     steps: int = 24,
 ) -> List[Tuple[float, float]]:
     """Return *steps* interpolated points on a Catmull-Rom segment p1→p2."""
-    tau = 0.5 * (1.0 - tension)
-    pts = []
-    for i in range(steps + 1):
-        s = i / steps
-        s2, s3 = s * s, s * s * s
-
-        x = (
-            tau * ((-s3 + 2 * s2 - s) * p0[0])
-            + (1.0) * ((2 * s3 - 3 * s2 + 1) * p1[0] + tau * (s3 - 2 * s2 + s) * p1[0])
-            + (1.0) * ((-2 * s3 + 3 * s2) * p2[0] + tau * (-s3 + s2) * p2[0])
-            + tau * ((s3 - s2) * p3[0])
+    return [
+        (
+            a * p0[0] + b * p1[0] + c * p2[0] + d * p3[0],
+            a * p0[1] + b * p1[1] + c * p2[1] + d * p3[1],
         )
-        y = (
-            tau * ((-s3 + 2 * s2 - s) * p0[1])
-            + (1.0) * ((2 * s3 - 3 * s2 + 1) * p1[1] + tau * (s3 - 2 * s2 + s) * p1[1])
-            + (1.0) * ((-2 * s3 + 3 * s2) * p2[1] + tau * (-s3 + s2) * p2[1])
-            + tau * ((s3 - s2) * p3[1])
-        )
-        pts.append((x, y))
-    return pts
+        for a, b, c, d in _catmull_rom_basis(tension, steps)
+    ]
+
+
+def _smooth_coords(
+    coords: List[float], out: List[float], tension: float, steps: int
+) -> None:
+    """Catmull-Rom interpolate one coordinate axis of a polyline into *out*.
+
+    *out* must hold ``(len(coords) - 1) * steps + 1`` values; it is written
+    in place so callers can keep reusing the same buffer.
+    """
+    basis = _catmull_rom_basis(tension, steps)
+    tail = basis[1:]
+    last = len(coords) - 1
+
+    out[0] = coords[0]
+    pos = 1
+    for i in range(last):
+        c0 = coords[i - 1] if i > 0 else coords[0]
+        c1 = coords[i]
+        c2 = coords[i + 1]
+        c3 = coords[i + 2] if i + 1 < last else coords[last]
+        out[pos : pos + steps] = [a * c0 + b * c1 + c * c2 + d * c3 for a, b, c, d in tail]
+        pos += steps
+
+
+class SplineBuffer:
+    """Reusable output buffers for a smoothed path.
+
+    ``xs``/``ys`` are only reallocated when the number of points or steps
+    changes, so redrawing an animated graph allocates no per-point tuples.
+    """
+
+    def __init__(self):
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def smooth(
+        self, xs: List[float], ys: List[float], tension: float, steps: int
+    ) -> "SplineBuffer":
+        """Fill the buffers with the smoothed curve through (xs, ys)."""
+        if len(xs) < 2:
+            self.xs[:] = xs
+            self.ys[:] = ys
+            return self
+
+        size = (len(xs) - 1) * steps + 1
+        if len(self.xs) != size:
+            self.xs = [0.0] * size
+            self.ys = [0.0] * size
+        _smooth_coords(xs, self.xs, tension, steps)
+        _smooth_coords(ys, self.ys, tension, steps)
+        return self
 
 
 def _smooth_path(
@@ -72,19 +141,10 @@ def _smooth_path(
     if len(points) < 2:
         return list(points)
 
-    padded = [points[0]] + list(points) + [points[-1]]
-    result: List[Tuple[float, float]] = []
-    for i in range(1, len(padded) - 2):
-        seg = _catmull_rom_segment(
-            padded[i - 1],
-            padded[i],
-            padded[i + 1],
-            padded[i + 2],
-            tension=tension,
-            steps=steps,
-        )
-        result.extend(seg if i == 1 else seg[1:])
-    return result
+    buffer = SplineBuffer().smooth(
+        [p[0] for p in points], [p[1] for p in points], tension, steps
+    )
+    return list(zip(buffer.xs, buffer.ys))
 
 
 # ── The widget ────────────────────────────────────────────────────────────────
@@ -95,6 +155,9 @@ class FlowGraph(Gtk.DrawingArea):
 
     __gtype_name__ = "FlowGraph"
 
+    # samples kept by push() when neither *window* nor set_values gave a size
+    DEFAULT_WINDOW = 30
+
     def __init__(
         self,
         values: Optional[List[float]] = None,
@@ -113,12 +176,16 @@ class FlowGraph(Gtk.DrawingArea):
         y_axis: bool = False,
         y_axis_format: str = "{:.0f}",
         y_axis_width: int = 30,
+        window: Optional[int] = None,
         **kwargs: Any,
     ):
         super().__init__(**kwargs)
         if not self.get_name():
             self.set_name("flow-graph")
 
+        # background, grid and axis labels, re-rendered only when they change
+        self._static_layer: Optional[cairo.ImageSurface] = None
+
         self.min_value = min_value
         self.max_value = max_value
         self.line_width = line_width
@@ -140,6 +207,16 @@ class FlowGraph(Gtk.DrawingArea):
         self._current: List[float] = list(values) if values else []
         self._target: List[float] = list(self._current)
         self._display: List[float] = list(self._current)
+        self._spline = SplineBuffer()
+
+        # ── scroll mode (push) ──────────────────────────────────
+        # holds one extra slot for the sample scrolling out on the left
+        self._ring: Optional[deque] = None
+        self._scroll = 1.0
+        self._incoming_from = 0.0
+        # samples push() collects before it starts scrolling
+        self.window = window
+        self._fill_to: Optional[int] = None
 
         # ── animator ────────────────────────────────────────────
         self._animator = Animator(
@@ -154,15 +231,45 @@ class FlowGraph(Gtk.DrawingArea):
         self._animator.connect("finished", self._on_finished)
 
         self.connect("destroy", self._on_destroy)
+        self.connect("size-allocate", self._invalidate_static_layer)
+        self.connect("style-updated", self._invalidate_static_layer)
+
+    # ── scale bounds (changing them invalidates the axis labels) ─────────
+
+    @property
+    def min_value(self) -> float:
+        return self._min_value
+
+    @min_value.setter
+    def min_value(self, value: float) -> None:
+        if getattr(self, "_min_value", None) != value:
+            self._min_value = value
+            self._invalidate_static_layer()
+
+    @property
+    def max_value(self) -> float:
+        return self._max_value
+
+    @max_value.setter
+    def max_value(self, value: float) -> None:
+        if getattr(self, "_max_value", None) != value:
+            self._max_value = value
+            self._invalidate_static_layer()
 
     # ── public API ─────────────────────────────────────────────────────────
 
-    def set_values(self, new_values: List[float]) -> None:
+    def set_values(self, new_values: Iterable[float]) -> None:
         """Animate from current data to *new_values*."""
         new = list(new_values)
         if not new:
             return
 
+        self._fill_to = None
+        # leaving scroll mode: continue from what is on screen
+        if self._ring is not None:
+            self._display = list(self._ring)[1:]
+            self._ring = None
+
         if not self._display:
             self._current = list(new)
             self._target = list(new)
@@ -186,8 +293,54 @@ class FlowGraph(Gtk.DrawingArea):
         self._animator.max_value = 1.0
         self._animator.play()
 
+    def push(self, value: float) -> None:
+        """Append one sample, scrolling the graph left by one slot.
+
+        The window keeps as many samples as the graph currently shows, or
+        *window* if given. With fewer than that, samples are appended without
+        scrolling until it is full. Only the newest point is tweened, so a
+        tick costs O(1) instead of rebuilding the whole list.
+        """
+        if self._ring is None:
+            # continue from what is on screen, even mid set_values tween
+            shown = self._display or self._target
+            if self._fill_to is None:
+                self._fill_to = self.window or (
+                    len(shown) if len(shown) >= 2 else self.DEFAULT_WINDOW
+                )
+            self._animator.pause()
+            if len(shown) < self._fill_to:
+                shown = [*shown, value]
+                self._current = list(shown)
+                self._target = list(shown)
+                self._display = shown
+                self.queue_draw()
+                return
+            size = self._fill_to
+            self._fill_to = None
+            self._ring = deque([shown[-size], *shown[-size:]], maxlen=size + 1)
+
+        self._incoming_from = self._ring[-1]
+        self._ring.append(value)
+
+        if not self.get_mapped():
+            # nothing to animate while hidden
+            self._scroll = 1.0
+            return
+
+        self._scroll = 0.0
+        self._animator.pause()
+        self._animator.value = 0.0
+        self._animator.min_value = 0.0
+        self._animator.max_value = 1.0
+        self._animator.play()
+
     def _on_tick(self, animator, *_args):
         t = animator.value
+        if self._ring is not None:
+            self._scroll = min(t, 1.0)
+            self.queue_draw()
+            return
         self._display = (
             [c + (tgt_v - c) for c, tgt_v in zip(self._current, self._target)]
             if t >= 1.0
@@ -196,6 +349,10 @@ class FlowGraph(Gtk.DrawingArea):
         self.queue_draw()
 
     def _on_finished(self, *_args):
+        if self._ring is not None:
+            self._scroll = 1.0
+            self.queue_draw()
+            return
         self._current = list(self._target)
         self._display = list(self._target)
         self.queue_draw()
@@ -205,8 +362,15 @@ class FlowGraph(Gtk.DrawingArea):
 
     # ── geometry helpers ───────────────────────────────────────────────────
 
-    def _normalize(self, raw: List[float]) -> List[Tuple[float, float]]:
-        """Map data values → (x, y) pixel coords (y grows *down* in Cairo)."""
+    def _normalize(
+        self, raw: Iterable[float], slots: Optional[int] = None, shift: float = 0.0
+    ) -> Tuple[List[float], List[float]]:
+        """Map data values → x and y pixel coords (y grows *down* in Cairo).
+
+        By default the points span the whole width. In scroll mode *slots*
+        is the number of gaps that fit the width and *shift* (0-1) moves
+        every point left by that fraction of a gap.
+        """
         w = self.get_allocated_width()
         h = self.get_allocated_height()
         pad = self.padding
@@ -216,19 +380,24 @@ class FlowGraph(Gtk.DrawingArea):
         draw_h = h - 2 * pad
         n = len(raw)
         if n < 2:
-            return []
+            return [], []
 
         lo, hi = self.min_value, self.max_value
         span = hi - lo if hi != lo else 1.0
 
-        pts: List[Tuple[float, float]] = []
-        for i, v in enumerate(raw):
-            x = pad + y_off + (i / (n - 1)) * draw_w
-            norm = (v - lo) / span
-            norm = max(0.0, min(1.0, norm))
-            y = pad + (1.0 - norm) * draw_h
-            pts.append((x, y))
-        return pts
+        x0 = pad + y_off
+        step = draw_w / (slots if slots else n - 1)
+        xs = [x0 + (i - shift) * step for i in range(n)]
+        ys = [pad + (1.0 - max(0.0, min(1.0, (v - lo) / span))) * draw_h for v in raw]
+        return xs, ys
+
+    def _value_to_y(self, value: float) -> float:
+        """Pixel y of a single data value (same mapping as _normalize)."""
+        pad = self.padding
+        draw_h = self.get_allocated_height() - 2 * pad
+        lo, hi = self.min_value, self.max_value
+        span = hi - lo if hi != lo else 1.0
+        return pad + (1.0 - max(0.0, min(1.0, (value - lo) / span))) * draw_h
 
     # ── GTK size negotiation ───────────────────────────────────────────────
 
@@ -239,6 +408,65 @@ class FlowGraph(Gtk.DrawingArea):
     def do_get_preferred_height(self):
         return 25, 50
 
+    # ── static layer ───────────────────────────────────────────────────────
+
+    def _invalidate_static_layer(self, *_args) -> None:
+        self._static_layer = None
+        self.queue_draw()
+
+    def _render_static_layer(self, w: int, h: int, rgba) -> cairo.ImageSurface:
+        """Render background, grid lines and Y-axis labels into a surface."""
+        scale = self.get_scale_factor()
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, w * scale, h * scale)
+        surface.set_device_scale(scale, scale)
+        cr = cairo.Context(surface)
+
+        grid_rgba = (1.0, 1.0, 1.0, 0.4)
+        y_off = self.y_axis_width if self.y_axis else 0
+        pad = self.padding
+
+        # background
+        if self.bg_rgba:
+            cr.set_source_rgba(*self.bg_rgba)
+            cr.rectangle(0, 0, w, h)
+            cr.fill()
+
+        if self.grid_lines <= 0:
+            return surface
+
+        draw_h = h - 2 * pad
+        font_desc = None
+        if self.y_axis:
+            font_desc = self.get_style_context().get_font(Gtk.StateFlags.NORMAL)
+            font_desc.set_size(int(8.5 * Pango.SCALE))
+
+        for i in range(self.grid_lines + 2):
+            frac = i / (self.grid_lines + 1)
+            y = pad + frac * draw_h
+
+            # grid line at every breakpoint (including top/bottom edges)
+            cr.set_source_rgba(*grid_rgba)
+            cr.set_line_width(0.5)
+            cr.move_to(pad + y_off, y)
+            cr.line_to(w - pad, y)
+            cr.stroke()
+
+            # Y-axis label (skip top and bottom edges)
+            if font_desc is not None and 0 < i < self.grid_lines + 1:
+                value = self.max_value - frac * (self.max_value - self.min_value)
+                label = self.y_axis_format.format(value)
+
+                layout = self.create_pango_layout(label)
+                layout.set_font_description(font_desc)
+                layout.set_alignment(Pango.Alignment.RIGHT)
+                _, lh = layout.get_pixel_size()
+
+                cr.set_source_rgba(rgba.red, rgba.green, rgba.blue, 0.35)
+                cr.move_to(pad, y - lh / 2)
+                PangoCairo.show_layout(cr, layout)
+
+        return surface
+
     # ── Cairo draw ─────────────────────────────────────────────────────────
 
     def do_draw(self, cr):
@@ -250,86 +478,49 @@ class FlowGraph(Gtk.DrawingArea):
         rgba = style_context.get_color(Gtk.StateFlags.NORMAL)
 
         line_rgba = (rgba.red, rgba.green, rgba.blue, rgba.alpha)
-        grid_rgba = (1.0, 1.0, 1.0, 0.4)
 
-        y_off = self.y_axis_width if self.y_axis else 0
         pad = self.padding
 
-        # background
-        if self.bg_rgba:
-            cr.set_source_rgba(*self.bg_rgba)
-            cr.rectangle(0, 0, w, h)
-            cr.fill()
-
-        # ── Y-axis labels + grid ────────────────────────────────
-        if self.grid_lines > 0:
-            draw_h = h - 2 * pad
-
-            for i in range(self.grid_lines + 2):
-                frac = i / (self.grid_lines + 1)
-                y = pad + frac * draw_h
-
-                # grid line (skip top edge i=0 and bottom edge i=grid_lines+1)
-                if 0 < i < self.grid_lines + 1:
-                    cr.set_source_rgba(*grid_rgba)
-                    cr.set_line_width(0.5)
-                    cr.move_to(pad + y_off, y)
-                    cr.line_to(w - pad, y)
-                    cr.stroke()
-
-                # Y-axis label
-                # ── Y-axis labels + grid ────────────────────────────────
-        if self.grid_lines > 0:
-            draw_h = h - 2 * pad
-
-            for i in range(self.grid_lines + 2):
-                frac = i / (self.grid_lines + 1)
-                y = pad + frac * draw_h
-
-                # grid line at every breakpoint (including top/bottom edges)
-                cr.set_source_rgba(*grid_rgba)
-                cr.set_line_width(0.5)
-                cr.move_to(pad + y_off, y)
-                cr.line_to(w - pad, y)
-                cr.stroke()
-
-                # Y-axis label (skip top and bottom edges)
-                if self.y_axis and 0 < i < self.grid_lines + 1:
-                    value = self.max_value - frac * (self.max_value - self.min_value)
-                    label = self.y_axis_format.format(value)
-
-                    layout = self.create_pango_layout(label)
-                    font_desc = style_context.get_font(Gtk.StateFlags.NORMAL)
-                    font_desc.set_size(int(8.5 * Pango.SCALE))
-                    layout.set_font_description(font_desc)
-                    layout.set_alignment(Pango.Alignment.RIGHT)
-                    lw, lh = layout.get_pixel_size()
-
-                    cr.set_source_rgba(rgba.red, rgba.green, rgba.blue, 0.35)
-                    cr.move_to(pad, y - lh / 2)
-                    PangoCairo.show_layout(cr, layout)
+        # ── background, grid, Y-axis labels (cached) ────────────
+        if self._static_layer is None:
+            self._static_layer = self._render_static_layer(w, h, rgba)
+        cr.set_source_surface(self._static_layer, 0, 0)
+        cr.paint()
 
         # ── data ────────────────────────────────────────────────
-        raw = self._display
-        if len(raw) < 2:
-            return
-
-        data_pts = self._normalize(raw)
-        smooth = _smooth_path(data_pts, tension=self.tension, steps=self.spline_steps)
+        if self._ring is not None and len(self._ring) > 2:
+            ring = self._ring
+            xs, ys = self._normalize(ring, slots=len(ring) - 2, shift=self._scroll)
+            # the newest point grows out of the previous one
+            newest = self._incoming_from + (ring[-1] - self._incoming_from) * self._scroll
+            ys[-1] = self._value_to_y(newest)
+
+            y_off = self.y_axis_width if self.y_axis else 0
+            cr.rectangle(pad + y_off, 0, w - 2 * pad - y_off, h)
+            cr.clip()
+        else:
+            raw = self._display
+            if len(raw) < 2:
+                return
+            xs, ys = self._normalize(raw)
+
+        smooth = self._spline.smooth(xs, ys, self.tension, self.spline_steps)
 
         if len(smooth) < 2:
             return
+        sx, sy = smooth.xs, smooth.ys
+        line_to = cr.line_to
 
         # ---- fill ----
-        cr.move_to(smooth[0][0], smooth[0][1])
-        for px, py in smooth[1:]:
-            cr.line_to(px, py)
+        cr.move_to(sx[0], sy[0])
+        for px, py in islice(zip(sx, sy), 1, None):
+            line_to(px, py)
 
-        cr.line_to(smooth[-1][0], h - pad)
-        cr.line_to(smooth[0][0], h - pad)
+        cr.line_to(sx[-1], h - pad)
+        cr.line_to(sx[0], h - pad)
         cr.close_path()
 
-        grad_y_top = min(p[1] for p in data_pts)
+        grad_y_top = min(ys)
         grad_y_bot = h - pad
         pat = cairo.LinearGradient(
             0, grad_y_top, 0, grad_y_bot
@@ -346,14 +537,14 @@ class FlowGraph(Gtk.DrawingArea):
         cr.set_line_join(1)
         cr.set_line_cap(1)
 
-        cr.move_to(smooth[0][0], smooth[0][1])
-        for px, py in smooth[1:]:
-            cr.line_to(px, py)
+        cr.move_to(sx[0], sy[0])
+        for px, py in islice(zip(sx, sy), 1, None):
+            line_to(px, py)
         cr.stroke()
 
         # ---- dots ----
         if self.dot_radius > 0:
             cr.set_source_rgba(*line_rgba)
-            for px, py in data_pts:
+            for px, py in zip(xs, ys):
                 cr.arc(px, py, self.dot_radius, 0, 6.283185307)
                 cr.fill()
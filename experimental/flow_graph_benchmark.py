@@ -0,0 +1,89 @@
+"""Micro-benchmark: legacy point-by-point Catmull-Rom vs the cached-basis version.
+
+Run from the repo root:  python -m experimental.flow_graph_benchmark
+"""
+
+import timeit
+from typing import List, Tuple
+
+from custom_widgets.flow_graph import SplineBuffer, _smooth_path
+
+
+# ── legacy implementation (as it was before the cached basis) ───────────────
+
+
+def legacy_catmull_rom_segment(p0, p1, p2, p3, tension=0.5, steps=24):
+    tau = 0.5 * (1.0 - tension)
+    pts = []
+    for i in range(steps + 1):
+        s = i / steps
+        s2, s3 = s * s, s * s * s
+
+        x = (
+            tau * ((-s3 + 2 * s2 - s) * p0[0])
+            + (1.0) * ((2 * s3 - 3 * s2 + 1) * p1[0] + tau * (s3 - 2 * s2 + s) * p1[0])
+            + (1.0) * ((-2 * s3 + 3 * s2) * p2[0] + tau * (-s3 + s2) * p2[0])
+            + tau * ((s3 - s2) * p3[0])
+        )
+        y = (
+            tau * ((-s3 + 2 * s2 - s) * p0[1])
+            + (1.0) * ((2 * s3 - 3 * s2 + 1) * p1[1] + tau * (s3 - 2 * s2 + s) * p1[1])
+            + (1.0) * ((-2 * s3 + 3 * s2) * p2[1] + tau * (-s3 + s2) * p2[1])
+            + tau * ((s3 - s2) * p3[1])
+        )
+        pts.append((x, y))
+    return pts
+
+
+def legacy_smooth_path(points, tension=0.4, steps=32):
+    if len(points) < 2:
+        return list(points)
+
+    padded = [points[0]] + list(points) + [points[-1]]
+    result: List[Tuple[float, float]] = []
+    for i in range(1, len(padded) - 2):
+        seg = legacy_catmull_rom_segment(
+            padded[i - 1], padded[i], padded[i + 1], padded[i + 2], tension, steps
+        )
+        result.extend(seg if i == 1 else seg[1:])
+    return result
+
+
+# ── benchmark ────────────────────────────────────────────────────────────────
+
+
+def _points(n: int) -> List[Tuple[float, float]]:
+    return [(i * 3.0, 50 + 40 * ((i * 7919) % 13) / 13) for i in range(n)]
+
+
+def main():
+    tension, steps = 0.4, 32
+    for n in (10, 30, 300):
+        pts = _points(n)
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        buffer = SplineBuffer()
+
+        expected = legacy_smooth_path(pts, tension, steps)
+        got = buffer.smooth(xs, ys, tension, steps)
+        err = max(
+            max(abs(a[0] - b), abs(a[1] - c))
+            for a, b, c in zip(expected, got.xs, got.ys)
+        )
+
+        number = max(1, 3000 // n)
+        legacy = timeit.timeit(lambda: legacy_smooth_path(pts, tension, steps), number=number)
+        tuples = timeit.timeit(lambda: _smooth_path(pts, tension, steps), number=number)
+        buffered = timeit.timeit(
+            lambda: buffer.smooth(xs, ys, tension, steps), number=number
+        )
+        print(
+            f"{n:>4} points: legacy {legacy / number * 1e3:7.3f} ms"
+            f" | _smooth_path {tuples / number * 1e3:7.3f} ms"
+            f" | SplineBuffer {buffered / number * 1e3:7.3f} ms"
+            f" | x{legacy / buffered:4.1f} | max error {err:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 """Module of Helper functions for the project"""
 
+import ctypes
+import signal
+
 from loguru import logger
 from gi.repository import GdkPixbuf  # type: ignore
 
@@ -61,3 +64,14 @@ def pixbuf_cropping_if_image_is_not_1_1(
 def truncate(text, max_len=15):
     """truncates text to given char len"""
     return text if len(text) <= max_len else text[: max_len - 1] + "…"
+
+
+def set_death_signal():
+    """
+    Set the death signal of the child process to SIGTERM so that if the parent
+    process is killed, the child is automatically terminated.
+    Meant to be passed as ``preexec_fn`` to subprocess.Popen.
+    """
+    libc = ctypes.CDLL("libc.so.6")
+    PR_SET_PDEATHSIG = 1
+    libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
@@ -9,7 +9,8 @@ from fabric.audio.service import Audio
 from fabric.utils import cooldown
 from gi.repository import GLib  # type: ignore
 
-from utils.popup_manager import popup_manager
+from utils.popup_manager import HoverPopupController
+from utils.lazy_popup import LazyPopup
 from custom_widgets.animated_scale import AnimatedScale
 from modules.audio.audio_popup import AudioPopup
 
@@ -57,21 +58,10 @@ class AudioWidget(Box):
         self.audio.connect("notify::speaker", self._on_speaker_changed)
 
         # ── popup state ────────────────────────────────────────
-        self._hide_timeout_id = None
-        self._show_delay_id = None
-
-        self.popup = AudioPopup(
-            parent=window,
-            pointing_to=self,
-            audio_service=self.audio,
-            exclusivity="none",
-        )
-
-        self.content_event_box.connect("enter-notify-event", self._hover_trigger)
-        self.content_event_box.connect("leave-notify-event", self._on_hover_leave)
-        self.popup.connect("enter-notify-event", self._on_popup_enter)
-        self.popup.connect("leave-notify-event", self._on_popup_leave)
-        #self.popup.do_reposition("x")
+        self._window = window
+        self._popup = LazyPopup(self._build_popup)
+        self._hover = HoverPopupController(self._popup, on_show=self._fill_popup)
+        self._hover.attach(self.content_event_box)
 
         # ── tick ───────────────────────────────────────────────
         GLib.timeout_add(1000, self._tick)
@@ -84,8 +74,8 @@ class AudioWidget(Box):
             return
         speaker.connect("notify::volume", self._update_ui)
         speaker.connect("notify::muted", self._update_ui)
-        speaker.connect("notify::volume", self.popup.refresh)
-        speaker.connect("notify::muted", self.popup.refresh)
+        speaker.connect("notify::volume", self._refresh_popup)
+        speaker.connect("notify::muted", self._refresh_popup)
         self._update_ui()
 
     def _update_ui(self, *_: Any):
@@ -117,49 +107,31 @@ class AudioWidget(Box):
     def _on_scale_change(self, _, __, value: float):
         self.audio.speaker.volume = value
 
-    # ── hover flow (mirrors Cpu exactly) ─────────────────────────
-
-    def _hover_trigger(self, *_):
-        self._show_delay_id = GLib.timeout_add(300, self._on_hover_enter)
-
-    def _on_hover_enter(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = None
-        self.popup.refresh()  # ← populate BEFORE showing
-        popup_manager.request_show(self.popup, self)
-        return False
+    # ── popup ───────────────────────────────────────────────────
 
-    def _on_hover_leave(self, *_):
-        self._schedule_hide()
-        if self._show_delay_id:
-            GLib.source_remove(self._show_delay_id)
-            self._show_delay_id = None
+    @property
+    def popup(self) -> AudioPopup:
+        return self._popup.get()
 
-    def _on_popup_enter(self, *_):
-        self._cancel_hide_timeout()
-
-    def _on_popup_leave(self, *_):
-        self._schedule_hide()
-
-    def _schedule_hide(self):
-        self._cancel_hide_timeout()
-        self._hide_timeout_id = GLib.timeout_add(1000, self._hide_popup)
+    def _build_popup(self) -> AudioPopup:
+        return AudioPopup(
+            parent=self._window,
+            pointing_to=self,
+            audio_service=self.audio,
+            exclusivity="none",
+        )
 
-    def _cancel_hide_timeout(self):
-        if self._hide_timeout_id:
-            GLib.source_remove(self._hide_timeout_id)
-            self._hide_timeout_id = None
+    def _refresh_popup(self, *_: Any):
+        # a popup that was never opened gets refreshed when it is shown
+        if self._popup.built:
+            self.popup.refresh()
 
-    def _hide_popup(self):
-        self.popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(250, self.popup.set_visible, False)
-        popup_manager.request_hide(self.popup, self)
-        self._hide_timeout_id = None
-        return False
+    def _fill_popup(self, popup):
+        popup.refresh()
 
     # ── tick ──────────────────────────────────────────────────────
 
     def _tick(self) -> bool:
-        if self.popup.get_visible():
+        if self._popup.visible:
             self.popup.refresh()
         return True
@@ -241,6 +241,8 @@ class AudioPopup(PopupWindow):
         self._audio = audio_service
         self._rows: dict[int, AppRow] = {}
         self._device_expanded = False
+        # the popup is destroyed when idle; stream handlers must go with it
+        self.connect("destroy", self._on_destroy)
 
         # ── content ────────────────────────────────────────────
         content = Box(orientation="v", name="audio-popup-content", spacing=6)
@@ -408,6 +410,11 @@ class AudioPopup(PopupWindow):
         except Exception as exc:
             logger.warning(f"Sink switch by description failed: {exc}")
 
+    def _on_destroy(self, *_):
+        for row in self._rows.values():
+            row.disconnect_stream()
+        self._rows.clear()
+
     # ────────────────────────────────────────────────────────────
     #  Refresh — called by AudioWidget on tick + before showing
     # ────────────────────────────────────────────────────────────
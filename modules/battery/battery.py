@@ -4,17 +4,23 @@ and also extra details in tooltip"""
 import subprocess
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
-from gi.repository import GLib  # type: ignore
 from loguru import logger
 import psutil
 
+from services.system_sampler import SystemSampler
+from services.theme_palette import ThemePalette, to_hex
+
+# gradient ends when the theme has no --color1 / --color2
+LOW_COLOR = (252 / 255, 56 / 255, 56 / 255, 1.0)  # pastel red
+HIGH_COLOR = (99 / 255, 252 / 255, 23 / 255, 1.0)  # pastel green
+
 
 class BatteryWidget(Box):
     """Battery widget that changes color based on battery percentage from green to red,
     and tells extra info in tooltips like time to charge, battery health etc
     """
 
-    def __init__(self, interval=10, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         self.glyph_label = Label(name="battery-glyph", label="󰠠")
@@ -24,28 +30,31 @@ class BatteryWidget(Box):
         self.add(self.percent_label)
 
         self.battery_health = "Unknown"
-        self.interval = interval
+        self._battery = None
+        self._palette = ThemePalette()
 
         self._on_upower_data(
             subprocess.getoutput(
                 "upower -i /org/freedesktop/UPower/devices/battery_BAT0"
             )
         )
-        self._refresh()
-        GLib.timeout_add_seconds(self.interval, self._refresh)
 
-    def _refresh(self):
-        battery = psutil.sensors_battery()
+        self._sampler = SystemSampler()
+        self._sampler.connect("battery-sampled", self._refresh)
+        self._palette.connect("changed", self._on_palette_changed)
+
+    def _refresh(self, _, battery):
+        self._battery = battery
         if not battery:
             self.glyph_label.set_label("󰂑")
             self.percent_label.set_label("")
             self.glyph_label.set_tooltip_text("No Battery Detected")
-            return True
+            return
 
         self.percent = battery.percent
         self.charging = battery.power_plugged
 
-        logger.debug(f"battery_obj obtained from psutil: {battery}")
+        logger.debug(f"battery snapshot obtained from sampler: {battery}")
 
         self.time_left = self._format_time(battery.secsleft)
 
@@ -72,7 +81,10 @@ class BatteryWidget(Box):
         )
         self.glyph_label.set_tooltip_markup(tooltip)
         self.percent_label.set_tooltip_markup(tooltip)
-        return True
+
+    def _on_palette_changed(self, *_):
+        if self._battery is not None:
+            self._refresh(None, self._battery)
 
     def _on_upower_data(self, output: str):
         line = output.strip()
@@ -112,20 +124,15 @@ class BatteryWidget(Box):
         return glyphs[index]
 
     def _get_color_for_percent(self, percent: float) -> str:
-        """Return a pastel gradient color from red to green based on percent."""
+        """Return a gradient color from the theme's red to its green based on percent."""
 
         percent = max(0, min(percent, 100)) / 100.0
 
-        # Pastel red (low %) to pastel green (high %)
-        red_start, green_start, blue_start = (252, 56, 56)  # pastel red
-        red_end, green_end, blue_end = (99, 252, 23)  # pastel green
+        start = self._palette.rgba("color1", LOW_COLOR)
+        end = self._palette.rgba("color2", HIGH_COLOR)
 
         # Linear interpolation
-        r = int(red_start + (red_end - red_start) * percent)
-        g = int(green_start + (green_end - green_start) * percent)
-        b = int(blue_start + (blue_end - blue_start) * percent)
-
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return to_hex(tuple(a + (b - a) * percent for a, b in zip(start, end)))
 
     def _format_time(self, secs: int) -> str:
         """returns the time if available in proper format"""
@@ -144,33 +151,37 @@ class BatteryWidget(Box):
         percent_str = f"{percent:.0f}%"
 
         if state == "charging":
-            color = "#a6e3a1"
+            color = self._palette.hex("color2", "#a6e3a1")
+            health_color = self._palette.hex("color6", "#89dceb")
             return (
                 f'<b><span foreground="{color}">Charging</span></b>\n'
                 f"<b>Level:</b> {percent_str}\n"
                 f"<b>Time to Full:</b> <tt>{time}</tt>\n"
-                f'<b>Health:</b> <span foreground="#89dceb">{health}</span>'
+                f'<b>Health:</b> <span foreground="{health_color}">{health}</span>'
             )
 
         if state == "discharging":
-            color = "#f9e2af"
+            color = self._palette.hex("color3", "#f9e2af")
+            health_color = self._palette.hex("color1", "#f38ba8")
             return (
                 f'<b><span foreground="{color}">On Battery</span></b>\n'
                 f"<b>Level:</b> {percent_str}\n"
                 f"<b>Time Left:</b> <tt>{time}</tt>\n"
-                f'<b>Health:</b> <span foreground="#f38ba8">{health}</span>'
+                f'<b>Health:</b> <span foreground="{health_color}">{health}</span>'
             )
 
         if state == "fully-charged":
-            color = "#94e2d5"
+            color = self._palette.hex("color6", "#94e2d5")
+            health_color = self._palette.hex("color4", "#89b4fa")
             return (
                 f'<b><span foreground="{color}">Fully Charged</span></b>\n'
                 f"<b>Level:</b> {percent_str}\n"
-                f'<b>Health:</b> <span foreground="#89b4fa">{health}</span>'
+                f'<b>Health:</b> <span foreground="{health_color}">{health}</span>'
             )
 
+        health_color = self._palette.hex("color7", "#f2cdcd")
         return (
             f"<b>Status:</b> {state.capitalize()}\n"
             f"<b>Level:</b> {percent_str}\n"
-            f'<b>Health:</b> <span foreground="#f2cdcd">{health}</span>'
+            f'<b>Health:</b> <span foreground="{health_color}">{health}</span>'
         )
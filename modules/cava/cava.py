@@ -1,12 +1,10 @@
 """holds cava widget"""
 
 import configparser
-import ctypes
 import os
-import re
 import signal
-import struct
 import subprocess
+import time
 
 
 from fabric.widgets.box import Box
@@ -16,13 +14,19 @@ from fabric.widgets.overlay import Overlay
 from gi.repository import Gdk, GLib, Gtk
 from loguru import logger
 
+from fabric.audio.service import Audio
+from helpers.helper_functions import set_death_signal
+from modules.cava import pcm_spectrum
+from services.playerctlservice import SimplePlayerctlService
+from services.theme_palette import ThemePalette
+
 
 class CavaWidget(Box):
     """music visualiser widget, uses unicode bar symbols to visualise music
     decibel level at different frequencies
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, playerctl_service=None, backend="cava", **kwargs):
         super().__init__(
             orientation="v",
             size=2,  # so it's not ignored by the compositor
@@ -35,7 +39,9 @@ class CavaWidget(Box):
 
         self.bars = 14
 
-        self.add(SpectrumRender().get_spectrum_box())
+        self.add(
+            SpectrumRender(playerctl_service, backend=backend).get_spectrum_box()
+        )
 
 
 def get_bars(file_path):
@@ -48,15 +54,8 @@ CAVA_CONFIG = get_relative_path("../config/cavalcade/cava.ini")
 
 bars = get_bars(CAVA_CONFIG)
 
-
-def set_death_signal():
-    """
-    Set the death signal of the child process to SIGTERM so that if the parent
-    process is killed, the child (cava) is automatically terminated.
-    """
-    libc = ctypes.CDLL("libc.so.6")
-    PR_SET_PDEATHSIG = 1
-    libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+# drawing color when the theme defines no --background
+DEFAULT_COLOR = (0.647, 0.784, 1.0, 1.0)
 
 
 class Cava:
@@ -70,12 +69,15 @@ class Cava:
     RESTARTING = 2
     CLOSING = 3
 
+    # frames drained from the FIFO per read when the main loop fell behind
+    FRAMES_PER_READ = 16
+
     def __init__(self, mainapp):
         self.bars = 14
         self.path = "/tmp/cava.fifo"
 
         self.cava_config_file = "modules/cava/cava_config"
-        self.data_handler = mainapp.draw.update
+        self.data_handler = mainapp.on_frame
         self.command = ["cava", "-p", self.cava_config_file]
         self.state = self.NONE
         self.process = None
@@ -88,12 +90,19 @@ class Cava:
             ("H", 2, 65535) if is_16bit else ("B", 1, 255)
         )
 
-        if not os.path.exists(self.path):
-            os.mkfifo(self.path)
+        # reads land in one preallocated buffer; an incomplete trailing
+        # frame is carried over to the start of it for the next read
+        self._frame_bytes = self.byte_size * self.bars
+        self._buf = bytearray(self._frame_bytes * self.FRAMES_PER_READ)
+        self._view = memoryview(self._buf)
+        self._fill = 0
+        # latest complete frame, normalised in place
+        self._frame = [0.0] * self.bars
 
         self.fifo_fd = None
         self.fifo_dummy_fd = None
         self.io_watch_id = None
+        self.paused = False
 
     def _run_process(self):
         try:
@@ -108,50 +117,94 @@ class Cava:
         except Exception:
             logger.exception("Fail to launch cava")
 
+    @property
+    def running(self) -> bool:
+        """True while the cava process is meant to be up."""
+        return self.state in (self.RUNNING, self.RESTARTING)
+
     def _start_io_reader(self):
+        # close() removes the FIFO, so it is created on every start
+        if not os.path.exists(self.path):
+            os.mkfifo(self.path)
+        self._fill = 0
         # Open FIFO in non-blocking mode for reading
         self.fifo_fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
         # Open dummy write end to prevent getting an EOF on our FIFO
         self.fifo_dummy_fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+        self._watch()
+
+    def _watch(self):
         self.io_watch_id = GLib.io_add_watch(
             self.fifo_fd, GLib.IO_IN, self._io_callback
         )
 
-    def _io_callback(self, source, condition):
-        chunk = self.byte_size * self.bars  # number of bytes for given format
-        try:
-            if self.fifo_fd is None:
-                return False
+    def _signal(self, sig):
+        if self.process and self.process.poll() is None:
+            try:
+                self.process.send_signal(sig)
+            except OSError:
+                pass
 
-            data = os.read(self.fifo_fd, chunk)
-        except OSError as e:
-            if e.errno == 11:  # EAGAIN - would block, normal for non-blocking
-                return True
-            elif e.errno == 9:  # EBADF - bad file descriptor
-                GLib.idle_add(self.restart)
-                return False
-            else:
-                return False
-        except Exception:
-            return False
+    def pause(self):
+        """Stop reading and freeze cava with SIGSTOP."""
+        if self.paused or self.state != self.RUNNING:
+            return
+        self.paused = True
+        if self.io_watch_id:
+            GLib.source_remove(self.io_watch_id)
+            self.io_watch_id = None
+        self._signal(signal.SIGSTOP)
 
-        # When no data is read, do not remove the IO watch immediately.
-        if len(data) < chunk:
-            if len(data) == 0:
-                # No data available, continue watching
-                return True
-            else:
-                return True
+    def resume(self):
+        """Continue a paused cava and read from it again."""
+        if not self.paused:
+            return
+        self.paused = False
+        self._signal(signal.SIGCONT)
+        if self.fifo_fd is not None and not self.io_watch_id:
+            self._watch()
 
-        try:
-            fmt = self.byte_type * self.bars  # format string for struct.unpack
-            sample = [i / self.byte_norm for i in struct.unpack(fmt, data)]
-            GLib.idle_add(self.data_handler, sample)
-        except (struct.error, Exception):
-            return True
+    def _io_callback(self, source, condition):
+        if self.fifo_fd is None:
+            return False
 
+        latest = -1
+        while True:
+            try:
+                n = os.readv(self.fifo_fd, [self._view[self._fill :]])
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == 9:  # EBADF - bad file descriptor
+                    GLib.idle_add(self.restart)
+                return False
+            if n == 0:
+                break
+
+            total = self._fill + n
+            complete = total - total % self._frame_bytes
+            if complete:
+                # only the newest frame matters; older queued ones are stale
+                latest = complete - self._frame_bytes
+                self._normalise(latest)
+            self._fill = total - complete
+            if self._fill:
+                self._buf[: self._fill] = self._buf[complete:total]
+            if total < len(self._buf):
+                break  # FIFO drained
+
+        if latest >= 0:
+            self.data_handler(self._frame)
         return True
 
+    def _normalise(self, offset: int):
+        values = self._view[offset : offset + self._frame_bytes].cast(self.byte_type)
+        frame = self._frame
+        norm = self.byte_norm
+        for i, value in enumerate(values):
+            frame[i] = value / norm
+        values.release()
+
     def _on_stop(self):
         if self.state == self.RESTARTING:
             self.start()
@@ -165,6 +218,7 @@ class Cava:
 
     def restart(self):
         """Restart cava process"""
+        self.resume()
         if self.state == self.RUNNING:
             self.state = self.RESTARTING
             if self.process and self.process.poll() is None:
@@ -174,6 +228,7 @@ class Cava:
 
     def close(self):
         """Stop cava process"""
+        self.resume()  # a stopped process would never see the kill
         self.state = self.CLOSING
 
         # Stop IO watch first
@@ -233,8 +288,6 @@ class Spectrum:
         self.silence_value = 0
         self.audio_sample = []
         self.color = None
-        self._cached_color = None
-        self._color_file_mtime = 0
 
         self.area = Gtk.DrawingArea()
         self.area.set_visible(True)
@@ -248,7 +301,14 @@ class Spectrum:
         self.silence = 10
         self.max_height = 16
 
+        # new frames only mark the spectrum dirty; a frame clock tick pulls
+        # the newest one at most once per vblank and stops once idle
+        self._dirty = False
+        self._tick_id = 0
+
         self.area.connect("configure-event", self.size_update)
+        self.palette = ThemePalette()
+        self.palette.connect("changed", self.color_update)
         self.color_update()
 
     def is_silence(self, value):
@@ -258,13 +318,25 @@ class Spectrum:
 
     def update(self, data):
         """Audio data processing"""
-        self.color_update_cached()
         self.audio_sample = data
         if not self.is_silence(self.audio_sample[0]):
-            self.area.queue_draw()
+            self._schedule_draw()
         elif self.silence_value == (self.silence + 1):
             self.audio_sample = [0] * self.sizes.number
-            self.area.queue_draw()
+            self._schedule_draw()
+
+    def _schedule_draw(self):
+        self._dirty = True
+        if not self._tick_id:
+            self._tick_id = self.area.add_tick_callback(self._on_tick)
+
+    def _on_tick(self, widget, _clock):
+        if not self._dirty:
+            self._tick_id = 0
+            return GLib.SOURCE_REMOVE
+        self._dirty = False
+        widget.queue_draw()
+        return GLib.SOURCE_CONTINUE
 
     def redraw(self, widget, cr):
         """Draw spectrum graph"""
@@ -303,68 +375,146 @@ class Spectrum:
         self.sizes.bar.width = max(int(tw / self.sizes.number), 1)
         self.sizes.bar.height = self.sizes.area.height
 
-    def color_update_cached(self):
-        """Set drawing color with caching to avoid file reads on every frame"""
-        color_file = get_relative_path("../../styles/colors.css")
-        try:
-            # Check if file has been modified
-            current_mtime = os.path.getmtime(color_file)
-            if current_mtime != self._color_file_mtime or self._cached_color is None:
-                self._color_file_mtime = current_mtime
-
-                hex_string = "#a5c8ff"  # default value
-                with open(color_file, "r") as f:
-                    content = f.read()
-                    m = re.findall(r"--background: \s*(#[0-9a-fA-F]{6})", content)
-                if m:
-                    # print("string:", m.string)
-                    hex_string = m[0]
-                    print(hex_string)
-
-                    red = int(hex_string[1:3], 16) / 255
-                    green = int(hex_string[3:5], 16) / 255
-                    blue = int(hex_string[5:7], 16) / 255
-                    self._cached_color = Gdk.RGBA(
-                        red=red, green=green, blue=blue, alpha=1.0
-                    )
-
-            self.color = self._cached_color
-        except Exception as e:
-            print(e)
-            if self._cached_color is None:
-                # Fallback to default color
-                self._cached_color = Gdk.RGBA(
-                    red=0.647, green=0.784, blue=1.0, alpha=1.0
-                )
-                self.color = self._cached_color
-
-    def color_update(self):
-        """Set drawing color according to current settings by reading primary color from CSS"""
-        hex_string = "#a5c8ff"  # default value
-        try:
-            with open(get_relative_path("../../styles/colors.css"), "r") as f:
-                content = f.read()
-                m = re.findall(r"--background: \s*(#[0-9a-fA-F]{6})", content)
-                if m:
-                    hex_string = m[0]
-
-        except Exception as e:
-            print(e)
-            pass
-        red = int(hex_string[1:3], 16) / 255
-        green = int(hex_string[3:5], 16) / 255
-        blue = int(hex_string[5:7], 16) / 255
+    def color_update(self, *_):
+        """Take the drawing color from the theme's --background"""
+        red, green, blue, _ = self.palette.rgba("background", DEFAULT_COLOR)
         self.color = Gdk.RGBA(red=red, green=green, blue=blue, alpha=1.0)
+        self.area.queue_draw()
 
 
 class SpectrumRender:
-    def __init__(self, mode=None, **kwargs):
+    # cava is paused after this many seconds of silence, then woken up
+    # every SILENCE_PROBE_INTERVAL seconds for SILENCE_PROBE_WINDOW to
+    # check whether audio came back
+    SILENCE_PAUSE = 5.0
+    SILENCE_PROBE_INTERVAL = 2
+    SILENCE_PROBE_WINDOW = 0.5
+
+    # once nothing is playing, cava is SIGSTOPped after IDLE_PAUSE seconds
+    # and shut down after IDLE_STOP seconds; it is (re)started as soon as
+    # playback begins, so short gaps between tracks never respawn it
+    IDLE_PAUSE = 3
+    IDLE_STOP = 60
+
+    def __init__(self, playerctl_service=None, backend="cava", mode=None, **kwargs):
         super().__init__(**kwargs)
         self.mode = mode
 
         self.draw = Spectrum()
-        self.cava = Cava(self)
-        self.cava.start()
+        self.cava = self._make_backend(backend)
+
+        # reasons cava is currently paused for ("hidden", "silence", "idle")
+        self._pause_reasons = set()
+        self._last_sound = time.monotonic()
+        self._probe_id = None
+        self._idle_id = None
+        self.draw.area.connect("map", lambda *_: self._set_paused("hidden", False))
+        self.draw.area.connect("unmap", lambda *_: self._set_paused("hidden", True))
+
+        # playback state decides whether cava runs at all
+        self.playerctl = playerctl_service or SimplePlayerctlService()
+        self.playerctl.connect("changed", self._on_playback_changed)
+        self.audio = Audio()
+        self.audio.connect("stream-added", self._on_playback_changed)
+        self.audio.connect("stream-removed", self._on_playback_changed)
+        self._on_playback_changed()
+
+    def _make_backend(self, backend):
+        """Frame source by name: "cava" runs the cava binary, "pcm" analyses
+        the sink monitor in-process and needs NumPy."""
+        if backend == "pcm":
+            if pcm_spectrum.AVAILABLE:
+                return pcm_spectrum.PcmSpectrum(self, bars=bars)
+            logger.warning("NumPy is not installed, falling back to cava")
+        return Cava(self)
+
+    # ── playback state ──────────────────────────────────────────
+
+    def _is_playing(self) -> bool:
+        """True if an MPRIS player is playing or an application has an
+        output stream open. A stream that stays open while paused keeps
+        cava alive, but silent, so the silence pause covers it."""
+        if any(
+            player.get_status() == "playing"
+            for player in self.playerctl.players.values()
+        ):
+            return True
+        return bool(self.audio.applications)
+
+    def _on_playback_changed(self, *_):
+        if self._is_playing():
+            self._cancel_idle()
+            self._set_paused("idle", False)
+            if not self.cava.running:
+                logger.debug("playback started, launching cava")
+                self._last_sound = time.monotonic()
+                self.cava.start()
+                self._apply_pause()
+        elif self.cava.running and not self._idle_id:
+            self._idle_id = GLib.timeout_add_seconds(self.IDLE_PAUSE, self._on_idle)
+
+    def _on_idle(self):
+        self._set_paused("idle", True)
+        self._idle_id = GLib.timeout_add_seconds(
+            self.IDLE_STOP - self.IDLE_PAUSE, self._on_idle_stop
+        )
+        return False
+
+    def _on_idle_stop(self):
+        self._idle_id = None
+        logger.debug("nothing played for a while, stopping cava")
+        self.cava.close()
+        self._set_paused("silence", False)
+        self._set_paused("idle", False)
+        return False
+
+    def _cancel_idle(self):
+        if self._idle_id:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = None
+
+    # ── frames / pausing ────────────────────────────────────────
+
+    def on_frame(self, frame):
+        """Called by Cava with the newest normalised frame."""
+        now = time.monotonic()
+        if any(frame):
+            self._last_sound = now
+        elif now - self._last_sound > self.SILENCE_PAUSE:
+            self._set_paused("silence", True)
+        self.draw.update(frame)
+
+    def _set_paused(self, reason, paused):
+        if paused:
+            self._pause_reasons.add(reason)
+        else:
+            self._pause_reasons.discard(reason)
+
+        if reason == "silence":
+            if self._probe_id:
+                GLib.source_remove(self._probe_id)
+                self._probe_id = None
+            if paused:
+                self._probe_id = GLib.timeout_add_seconds(
+                    self.SILENCE_PROBE_INTERVAL, self._probe_silence
+                )
+
+        self._apply_pause()
+
+    def _apply_pause(self):
+        if self._pause_reasons:
+            self.cava.pause()
+        else:
+            self.cava.resume()
+
+    def _probe_silence(self):
+        self._probe_id = None
+        # give cava a short window to report sound before pausing again
+        self._last_sound = (
+            time.monotonic() - self.SILENCE_PAUSE + self.SILENCE_PROBE_WINDOW
+        )
+        self._set_paused("silence", False)
+        return False
 
     def get_spectrum_box(self):
         # Get the spectrum box
@@ -0,0 +1,305 @@
+"""In-process spectrum analyser, an alternative to the cava subprocess.
+
+PCM is read straight from the default sink's monitor through ``parec``
+(PipeWire serves it through pipewire-pulse as well), or from a 16-bit WAV
+file, and turned into log-spaced bands with NumPy's ``rfft``. Frames go to
+the same ``on_frame`` handler cava feeds, so ``SpectrumRender`` can use
+either backend. There is no FIFO and no config file on disk, so several
+bars can run side by side.
+
+NumPy is optional; check :data:`AVAILABLE` before using this backend.
+:class:`BandAnalyser` has no GLib dependency and can be benchmarked
+offline against a recording::
+
+    rate, samples = read_wav("song.wav")
+    analyser = BandAnalyser(rate)
+    hop = rate // 60
+    for start in range(0, len(samples), hop):
+        analyser.feed(samples[start : start + hop])
+"""
+
+import os
+import signal
+import subprocess
+import wave
+
+from gi.repository import GLib  # type: ignore
+from loguru import logger
+
+from helpers.helper_functions import set_death_signal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+
+def read_wav(path: str):
+    """(sample rate, mono float32 samples in [-1, 1]) of a 16-bit WAV file."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        data = wav.readframes(wav.getnframes())
+    samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return rate, samples
+
+
+class BandAnalyser:
+    """Turns a stream of mono samples into normalised, log-spaced bands.
+
+    ``feed`` keeps the last ``fft_size`` samples and returns one frame of
+    ``bars`` values in [0, 1] for them. Bars rise instantly and fall by
+    ``smoothing`` per frame (0 disables it). With ``autosens`` the gain
+    drops quickly whenever a bar would overshoot and creeps back up while
+    sound stays quiet, much like cava's autosens.
+    """
+
+    # amplitudes below this count as silence, so fading bars reach zero
+    # and autosens does not amplify the noise floor
+    NOISE_FLOOR = 1e-4
+    INITIAL_SENSITIVITY = 20.0
+
+    def __init__(
+        self,
+        rate: int,
+        bars: int = 14,
+        fft_size: int = 4096,
+        low_cutoff: float = 50,
+        high_cutoff: float = 8000,
+        smoothing: float = 0.7,
+        autosens: bool = True,
+        sensitivity: float = INITIAL_SENSITIVITY,
+    ):
+        self.bars = bars
+        self.smoothing = smoothing
+        self.autosens = autosens
+        self.sensitivity = sensitivity
+
+        self._window = np.hanning(fft_size).astype(np.float32)
+        # scale so a full-scale sine reads as amplitude 1
+        self._scale = 2 / self._window.sum()
+        self._ring = np.zeros(fft_size, dtype=np.float32)
+        self._frame = np.zeros(bars, dtype=np.float32)
+
+        # bin ranges of each band; every band gets at least one bin
+        high_cutoff = min(high_cutoff, rate / 2)
+        edges = np.geomspace(low_cutoff, high_cutoff, bars + 1) * fft_size / rate
+        bins = edges.astype(int)
+        for i in range(1, len(bins)):
+            bins[i] = max(bins[i], bins[i - 1] + 1)
+        self._starts = bins[:-1]
+        self._stops = bins[1:]
+
+    def feed(self, samples) -> list:
+        """Push new samples and return the current frame."""
+        ring = self._ring
+        count = len(samples)
+        if count >= len(ring):
+            ring[:] = samples[-len(ring) :]
+        elif count:
+            ring[:-count] = ring[count:]
+            ring[-count:] = samples
+
+        spectrum = np.abs(np.fft.rfft(ring * self._window)) * self._scale
+        # the peak bin, so wide high bands are not diluted by averaging
+        bands = np.maximum.reduceat(spectrum[: self._stops[-1]], self._starts)
+        bands[bands < self.NOISE_FLOOR] = 0
+
+        frame = bands * self.sensitivity
+        peak = frame.max()
+        if self.autosens:
+            if peak > 1:
+                self.sensitivity *= 0.98
+            elif peak > 0:
+                self.sensitivity *= 1.002
+        np.minimum(frame, 1, out=frame)
+
+        if self.smoothing:
+            np.maximum(frame, self._frame * self.smoothing, out=frame)
+            frame[frame < 1e-3] = 0
+        self._frame = frame
+        return frame.tolist()
+
+
+class PcmSpectrum:
+    """Spectrum backend with the same lifecycle as ``Cava``.
+
+    Reads PCM from ``source`` through ``parec``, or plays back ``wav_file``
+    at real-time speed in a loop, and hands every frame to
+    ``mainapp.on_frame``.
+    """
+
+    NONE = 0
+    RUNNING = 1
+    CLOSING = 3
+
+    RATE = 44100
+    SAMPLE_BYTES = 2  # s16le mono
+    READ_SIZE = 16384
+
+    def __init__(
+        self,
+        mainapp,
+        bars: int = 14,
+        source: str = "@DEFAULT_MONITOR@",
+        wav_file: str = None,
+        framerate: int = 60,
+        **analyser_options,
+    ):
+        self.bars = bars
+        self.source = source
+        self.wav_file = wav_file
+        self.framerate = framerate
+        self.analyser_options = analyser_options
+        self.data_handler = mainapp.on_frame
+        self.command = [
+            "parec",
+            f"--device={source}",
+            "--format=s16le",
+            f"--rate={self.RATE}",
+            "--channels=1",
+            "--raw",
+            f"--latency-msec={1000 // framerate}",
+        ]
+
+        self.state = self.NONE
+        self.process = None
+        self.analyser = None
+        self.paused = False
+        self.io_watch_id = None
+
+        self._buf = bytearray(self.READ_SIZE)
+        self._view = memoryview(self._buf)
+        self._fill = 0
+        # WAV playback
+        self._samples = None
+        self._position = 0
+        self._hop = 0
+
+    @property
+    def running(self) -> bool:
+        """True while the backend is meant to be producing frames."""
+        return self.state == self.RUNNING
+
+    def start(self):
+        """Start capturing."""
+        if self.running:
+            return
+        try:
+            if self.wav_file:
+                rate, self._samples = read_wav(self.wav_file)
+                self._position = 0
+                self._hop = max(1, rate // self.framerate)
+            else:
+                rate = self.RATE
+                self.process = subprocess.Popen(
+                    self.command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    preexec_fn=set_death_signal,
+                )
+                os.set_blocking(self.process.stdout.fileno(), False)
+        except Exception:
+            logger.exception("Fail to start the spectrum analyser")
+            return
+        self.analyser = BandAnalyser(rate, bars=self.bars, **self.analyser_options)
+        self._fill = 0
+        self.state = self.RUNNING
+        self._watch()
+
+    def _watch(self):
+        if self.wav_file:
+            self.io_watch_id = GLib.timeout_add(
+                1000 // self.framerate, self._wav_callback
+            )
+        else:
+            self.io_watch_id = GLib.io_add_watch(
+                self.process.stdout.fileno(),
+                GLib.IO_IN | GLib.IO_HUP,
+                self._io_callback,
+            )
+
+    def _unwatch(self):
+        if self.io_watch_id:
+            GLib.source_remove(self.io_watch_id)
+            self.io_watch_id = None
+
+    def _io_callback(self, fd, condition):
+        frame = None
+        while True:
+            try:
+                n = os.readv(fd, [self._view[self._fill :]])
+            except BlockingIOError:
+                break
+            except OSError:
+                n = 0
+            if n == 0:
+                # parec exited; the next start() launches a new one
+                logger.warning("parec stopped, spectrum analyser is idle")
+                self.io_watch_id = None
+                self.close()
+                return False
+
+            total = self._fill + n
+            usable = total - total % self.SAMPLE_BYTES
+            if usable:
+                samples = np.frombuffer(self._buf, dtype="<i2", count=usable // 2)
+                frame = self.analyser.feed(samples.astype(np.float32) / 32768)
+            self._fill = total - usable
+            if self._fill:
+                self._buf[: self._fill] = self._buf[usable:total]
+            if total < len(self._buf):
+                break  # pipe drained
+
+        if frame is not None:
+            self.data_handler(frame)
+        return True
+
+    def _wav_callback(self):
+        end = self._position + self._hop
+        chunk = self._samples[self._position : end]
+        self._position = end if end < len(self._samples) else 0
+        self.data_handler(self.analyser.feed(chunk))
+        return True
+
+    def pause(self):
+        """Stop producing frames; parec is SIGSTOPped."""
+        if self.paused or not self.running:
+            return
+        self.paused = True
+        self._unwatch()
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGSTOP)
+
+    def resume(self):
+        """Produce frames again after :meth:`pause`."""
+        if not self.paused:
+            return
+        self.paused = False
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGCONT)
+        if self.running and not self.io_watch_id:
+            self._watch()
+
+    def close(self):
+        """Stop capturing and release the parec process."""
+        self.resume()
+        self.state = self.CLOSING
+        self._unwatch()
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+                try:
+                    self.process.wait(timeout=2.0)
+                except subprocess.TimeoutExpired:
+                    pass
+            self.process.stdout.close()
+            self.process = None
+        self._samples = None
@@ -5,7 +5,8 @@ from fabric.widgets.box import Box
 from fabric.widgets.eventbox import EventBox
 from gi.repository import GLib  # type: ignore
 
-from utils.popup_manager import popup_manager
+from utils.popup_manager import HoverPopupController
+from utils.lazy_popup import LazyPopup
 from modules.clock.clock_popup import ClockPopup
 
 
@@ -31,24 +32,14 @@ class Clock(Box):
         self.add(self.content_event_box)
 
         # ── popup state ────────────────────────────────────────
-        self._hide_timeout_id = None
-        self._show_delay_id = None
-
-        self.popup = ClockPopup(
-            parent=window,
-            pointing_to=self,
-            exclusivity="none",
+        self._window = window
+        self._popup = LazyPopup(self._build_popup)
+        self._hover = HoverPopupController(
+            self._popup,
+            on_show=self._fill_popup,
+            unmap_delay=450,
         )
-
-        self.content_event_box.connect(
-            "enter-notify-event", self._hover_trigger
-        )
-        self.content_event_box.connect(
-            "leave-notify-event", self._on_hover_leave
-        )
-        self.popup.connect("enter-notify-event", self._on_popup_enter)
-        self.popup.connect("leave-notify-event", self._on_popup_leave)
-        #self.popup.do_reposition("x")
+        self._hover.attach(self.content_event_box)
 
         # ── tick for popup time update ─────────────────────────
         GLib.timeout_add(1000, self._tick)
@@ -56,46 +47,22 @@ class Clock(Box):
     # ── tick ────────────────────────────────────────────────────
 
     def _tick(self):
-        if self.popup.get_visible():
+        if self._popup.visible:
             self.popup.update()
         return True
 
-    # ── hover flow ──────────────────────────────────────────────
-
-    def _hover_trigger(self, *_):
-        self._show_delay_id = GLib.timeout_add(300, self._on_hover_enter)
+    # ── popup ───────────────────────────────────────────────────
 
-    def _on_hover_enter(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = None
-        self.popup.update()
-        popup_manager.request_show(self.popup, self)
-        return False
+    @property
+    def popup(self) -> ClockPopup:
+        return self._popup.get()
 
-    def _on_hover_leave(self, *_):
-        self._schedule_hide()
-        if self._show_delay_id:
-            GLib.source_remove(self._show_delay_id)
-            self._show_delay_id = None
-
-    def _on_popup_enter(self, *_):
-        self._cancel_hide_timeout()
-
-    def _on_popup_leave(self, *_):
-        self._schedule_hide()
-
-    def _schedule_hide(self):
-        self._cancel_hide_timeout()
-        self._hide_timeout_id = GLib.timeout_add(1000, self._hide_popup)
-
-    def _cancel_hide_timeout(self):
-        if self._hide_timeout_id:
-            GLib.source_remove(self._hide_timeout_id)
-            self._hide_timeout_id = None
+    def _build_popup(self) -> ClockPopup:
+        return ClockPopup(
+            parent=self._window,
+            pointing_to=self,
+            exclusivity="none",
+        )
 
-    def _hide_popup(self):
-        self.popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(450, self.popup.set_visible, False)
-        popup_manager.request_hide(self.popup, self)
-        self._hide_timeout_id = None
-        return False
+    def _fill_popup(self, popup):
+        popup.update()
@@ -2,15 +2,15 @@
 
 from collections import deque
 
-import psutil
-
 from fabric.widgets.box import Box
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
-from gi.repository import GLib  # type: ignore
 
-from utils.popup_manager import popup_manager
+from utils.popup_manager import HoverPopupController
+from utils.lazy_popup import LazyPopup
+from services.system_sampler import SystemSampler
+from utils.metric_history import metric_history
 from custom_widgets.animated_circular_progress_bar import AnimatedCircularProgressBar
 from modules.cpu.cpu_popup import CpuPopup
 
@@ -57,119 +57,75 @@ class Cpu(Box):
         self.add(self.content_event_box)
 
         # ── state ───────────────────────────────────────────────────
+        # seeded from the persisted history so the graph survives restarts
         self._history: deque = deque(
-            [0.0] * self.HISTORY_LENGTH, maxlen=self.HISTORY_LENGTH
+            metric_history.recent("cpu", self.HISTORY_LENGTH),
+            maxlen=self.HISTORY_LENGTH,
         )
 
-        self._hide_timeout_id = None
-        self._show_delay_id = None
-
-        # ── popup ───────────────────────────────────────────────────
-        self.popup = CpuPopup(
-            parent=window,
-            pointing_to=self,
-            exclusivity="none",
+        # ── popup (built on first hover) ────────────────────────────
+        self._window = window
+        self._popup = LazyPopup(self._build_popup)
+        self._hover = HoverPopupController(
+            self._popup,
+            on_show=self._fill_popup,
+            on_hide=self._on_popup_hidden,
         )
+        self._hover.attach(self.content_event_box)
 
-        # hover on bar
-        self.content_event_box.connect("enter-notify-event", self._hover_trigger)
-        self.content_event_box.connect("leave-notify-event", self._on_hover_leave)
-        # hover on popup itself (pointer moved from bar into popup)
-        self.popup.connect("enter-notify-event", self._on_popup_enter)
-        self.popup.connect("leave-notify-event", self._on_popup_leave)
-
-        #self.popup.do_reposition("x")
-
-        # ── polling ─────────────────────────────────────────────────
-        self._tick()
-        GLib.timeout_add(1000, self._tick)
+        # ── sampling (shared SystemSampler tick) ────────────────────
+        self._sampler = SystemSampler()
+        self._sampler.connect("cpu-sampled", self._on_cpu_sampled)
 
     # ────────────────────────────────────────────────────────────────
-    #  Hover / show / hide  (mirrors the Mpris pattern)
+    #  Popup
     # ────────────────────────────────────────────────────────────────
 
-    def _hover_trigger(self, *_):
-        """Enter on the bar — start a short delay before showing."""
-        self._show_delay_id = GLib.timeout_add(300, self._on_hover_enter)
-
-    def _on_hover_enter(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = None
-
-        self.popup.update(self._history, self._build_stats_markup())
-        popup_manager.request_show(self.popup, self)  # ← add this
-
-        return False
+    @property
+    def popup(self) -> CpuPopup:
+        return self._popup.get()
 
-    def _on_hover_leave(self, *_):
-        self._schedule_hide()
-        if self._show_delay_id:
-            GLib.source_remove(self._show_delay_id)
-            self._show_delay_id = None
-
-    def _on_popup_enter(self, *_):
-        self._cancel_hide_timeout()
-
-    def _on_popup_leave(self, *_):
-        self._schedule_hide()
-
-    def _schedule_hide(self):
-        self._cancel_hide_timeout()
-        self._hide_timeout_id = GLib.timeout_add(1000, self._hide_popup)
+    def _build_popup(self) -> CpuPopup:
+        return CpuPopup(
+            parent=self._window,
+            pointing_to=self,
+            exclusivity="none",
+        )
 
-    def _cancel_hide_timeout(self):
-        if self._hide_timeout_id:
-            GLib.source_remove(self._hide_timeout_id)
-            self._hide_timeout_id = None
+    def _fill_popup(self, popup):
+        # frequency and sensors are only read while the popup is open
+        self._sampler.subscribe("cpu", "popup")
+        popup.update(self._history, self._build_stats_markup())
 
-    def _hide_popup(self):
-        self.popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(250, self.popup.set_visible, False)
-        popup_manager.request_hide(self.popup, self)  # ← add this
-        self._hide_timeout_id = None
-        return False
+    def _on_popup_hidden(self):
+        self._sampler.unsubscribe("cpu", "popup")
 
     # ────────────────────────────────────────────────────────────────
     #  Data
     # ────────────────────────────────────────────────────────────────
 
-    def get_cpu_usage(self) -> float:
-        """Get the current total CPU usage percentage."""
-        return psutil.cpu_percent()
-
-    def _get_details(self):
-        try:
-            return (
-                psutil.cpu_freq(),
-                psutil.cpu_percent(percpu=True),
-                psutil.sensors_temperatures()["coretemp"][0],
-                psutil.sensors_fans()["asus"][0],
-            )
-        except (KeyError, IndexError):
-            return None
-
     def _build_stats_markup(self) -> str:
-        details = self._get_details()
-        if details is None:
+        cpu, details = self._sampler.cpu, self._sampler.cpu_details
+        if cpu is None or details is None:
             return "<b>CPU</b>"
 
-        cur_freq, per_core_usage, cpu_temp, cpu_fan_speed = details
+        cpu_temp = details.temperature
         bar_chars = "▁▂▃▄▅▆▇█"
 
         cores = "".join(
             bar_chars[min(int((c / 100) * (len(bar_chars) - 1)), len(bar_chars) - 1)]
-            for c in per_core_usage
+            for c in cpu.per_core
         )
 
         freq_color = (
             "#A3DC9A"
-            if cur_freq.current <= 1000
-            else "#FCF67E" if cur_freq.current < 3500 else "#FF5454"
+            if details.frequency <= 1000
+            else "#FCF67E" if details.frequency < 3500 else "#FF5454"
         )
         temp_color = (
             "#A3DC9A"
-            if cpu_temp.current <= 45
-            else "#FCF67E" if cpu_temp.current <= 75 else "#FF5454"
+            if cpu_temp <= 45
+            else "#FCF67E" if cpu_temp <= 75 else "#FF5454"
         )
 
         return "\n".join(
@@ -177,23 +133,23 @@ class Cpu(Box):
                 "<b>CPU</b>",
                 (
                     f'Freq: <span foreground="{freq_color}">'
-                    f"{cur_freq.current / 1000:.2f} GHz</span>"
+                    f"{details.frequency / 1000:.2f} GHz</span>"
                 ),
                 f"<tt>Core: {cores}</tt>",
                 (
                     f'Temp: <span foreground="{temp_color}">'
-                    f"{cpu_temp.current}\u00b0C</span>"
+                    f"{cpu_temp}\u00b0C</span>"
                 ),
-                f"Fan: {cpu_fan_speed.current} RPM",
+                f"Fan: {details.fan_speed} RPM",
             ]
         )
 
     # ────────────────────────────────────────────────────────────────
-    #  Polling (every 1 s)
+    #  Sampling (SystemSampler, every 1 s)
     # ────────────────────────────────────────────────────────────────
 
-    def _tick(self) -> bool:
-        value = self.get_cpu_usage()
+    def _on_cpu_sampled(self, _, snapshot):
+        value = snapshot.percent
         self._history.append(value)
 
         # circular progress — only animate on jumps > 3 %
@@ -202,7 +158,5 @@ class Cpu(Box):
         self.progress_bar.set_value(value)
 
         # live-update popup while open
-        if self.popup.get_visible():
-            self.popup.update(self._history, self._build_stats_markup())
-
-        return True
+        if self._popup.visible:
+            self.popup.push(value, self._build_stats_markup())
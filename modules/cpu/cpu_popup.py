@@ -76,5 +76,10 @@ class CpuPopup(PopupWindow):
 
     def update(self, history, stats_markup):
         """Push new data into the graph and stats label."""
-        self.graph.set_values(list(history))
+        self.graph.set_values(history)
+        self.stats_label.set_markup(stats_markup)
+
+    def push(self, value, stats_markup):
+        """Scroll one new sample into the graph and refresh the stats label."""
+        self.graph.push(value)
         self.stats_label.set_markup(stats_markup)
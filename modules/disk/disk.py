@@ -1,19 +1,16 @@
 """Disk space widget with usage label and hover-activated popup."""
 
-import shutil
-import psutil
-from gi.repository import GLib  # type: ignore
-
 from tabulate import tabulate
 from fabric.widgets.box import Box
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.label import Label
 
-from utils.popup_manager import popup_manager
+from utils.popup_manager import HoverPopupController
+from utils.lazy_popup import LazyPopup
+from services.system_sampler import SystemSampler
 from .disk_popup import DiskPopup
 
 CONVERSION_CONST = 1073741824
-MONITORED_PATHS = ["/"]
 
 
 class DiskWidget(Box):
@@ -33,88 +30,45 @@ class DiskWidget(Box):
         self.content_event_box.add(self.content_box)
         self.add(self.content_event_box)
 
-        self._hide_timeout_id = None
-        self._show_delay_id = None
-
         # ── popup ───────────────────────────────────────────────
-        self.popup = DiskPopup(
-            parent=window,
-            pointing_to=self,
-            exclusivity="none",
+        self._window = window
+        self._popup = LazyPopup(self._build_popup)
+        self._hover = HoverPopupController(
+            self._popup,
+            on_show=self._fill_popup,
+            on_hide=self._on_popup_hidden,
         )
+        self._hover.attach(self.content_event_box)
 
-        self.content_event_box.connect("enter-notify-event", self._hover_trigger)
-        self.content_event_box.connect("leave-notify-event", self._on_hover_leave)
-        self.popup.connect("enter-notify-event", self._on_popup_enter)
-        self.popup.connect("leave-notify-event", self._on_popup_leave)
-        # self.popup.do_reposition("x")
-
-        self.update_label()
-        GLib.timeout_add(10000, self.update_label)
-
-    # ── Hover / show / hide ─────────────────────────────────────
-
-    def _hover_trigger(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = GLib.timeout_add(300, self._on_hover_enter)
-
-    def _on_hover_enter(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = None
-
-        self.popup.update(self._build_stats_markup())
-        popup_manager.request_show(self.popup, self)
-
-        return False
+        # ── sampling (shared SystemSampler tick) ────────────────
+        self._sampler = SystemSampler()
+        self._sampler.connect("disk-sampled", self._on_disk_sampled)
 
-    def _on_hover_leave(self, *_):
-        self._schedule_hide()
-        if self._show_delay_id:
-            GLib.source_remove(self._show_delay_id)
-            self._show_delay_id = None
+    # ── popup ───────────────────────────────────────────────────
 
-    def _on_popup_enter(self, *_):
-        self._cancel_hide_timeout()
+    @property
+    def popup(self) -> DiskPopup:
+        return self._popup.get()
 
-    def _on_popup_leave(self, *_):
-        self._schedule_hide()
-
-    def _schedule_hide(self):
-        self._cancel_hide_timeout()
-        self._hide_timeout_id = GLib.timeout_add(1000, self._hide_popup)
+    def _build_popup(self) -> DiskPopup:
+        return DiskPopup(
+            parent=self._window,
+            pointing_to=self,
+            exclusivity="none",
+        )
 
-    def _cancel_hide_timeout(self):
-        if self._hide_timeout_id:
-            GLib.source_remove(self._hide_timeout_id)
-            self._hide_timeout_id = None
+    def _fill_popup(self, popup):
+        # other partitions are only enumerated while the popup is open
+        self._sampler.subscribe("disk", "popup")
+        popup.update(self._build_stats_markup())
 
-    def _hide_popup(self):
-        self.popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(250, self.popup.set_visible, False)
-        popup_manager.request_hide(self.popup, self)
-        self._hide_timeout_id = None
-        return False
+    def _on_popup_hidden(self):
+        self._sampler.unsubscribe("disk", "popup")
 
     # ── Data ────────────────────────────────────────────────────
 
     def _build_stats_markup(self):
-
-        rows = []
-
-        for path in MONITORED_PATHS:
-            rows.append(self._format_row(path, shutil.disk_usage(path)))
-
-        for part in psutil.disk_partitions(all=False):
-            if part.mountpoint in MONITORED_PATHS:
-                continue
-            try:
-                rows.append(
-                    self._format_row(
-                        part.mountpoint, shutil.disk_usage(part.mountpoint)
-                    )
-                )
-            except PermissionError:
-                pass
+        rows = [self._format_row(disk.path, disk) for disk in self._sampler.partitions]
 
         if not rows:
             return ""
@@ -139,12 +93,8 @@ class DiskWidget(Box):
 
         return [mount, f"{used_gb:.1f}/{total_gb:.1f} GB", f"{free_gb:.1f} GB", pct_str]
 
-    def update_label(self) -> bool:
-        usage = shutil.disk_usage(MONITORED_PATHS[0])
-        pct = (usage.used / usage.total) * 100
-        self.usage_label.set_label(f"{pct:.0f}%")
+    def _on_disk_sampled(self, _, snapshot):
+        self.usage_label.set_label(f"{snapshot.percent:.0f}%")
 
-        if self.popup.get_visible():
+        if self._popup.visible:
             self.popup.update(self._build_stats_markup())
-
-        return True
@@ -114,6 +114,12 @@ class GpuPopup(PopupWindow):
 
     def update(self, core_history, vram_history, stats_markup):
         """Push new data into both graphs and the stats label."""
-        self.core_graph.set_values(list(core_history))
-        self.vram_graph.set_values(list(vram_history))
+        self.core_graph.set_values(core_history)
+        self.vram_graph.set_values(vram_history)
+        self.stats_label.set_markup(stats_markup)
+
+    def push(self, core_value, vram_value, stats_markup):
+        """Scroll one new sample into both graphs and refresh the stats label."""
+        self.core_graph.push(core_value)
+        self.vram_graph.push(vram_value)
         self.stats_label.set_markup(stats_markup)
@@ -5,6 +5,7 @@ from fabric.widgets.button import Button
 from fabric.widgets.eventbox import EventBox
 from custom_widgets.popup_window import PopupWindow
 from custom_widgets.HackedStackRevealer import HackedRevealer as Revealer
+from utils.lazy_popup import LazyPopup
 import subprocess
 from gi.repository import GLib  # type: ignore
 
@@ -120,14 +121,28 @@ class LogoutButton(Box):
         self.button = Button(label="⏻", name="logout")
         self.content = EventBox(
             on_button_release_event=self._trigger_logout,
-            on_enter_notify_event=lambda *a: self.popup.on_popup_enter(),
-            on_leave_notify_event=lambda *a: self.popup.on_popup_leave(),
+            on_enter_notify_event=self._on_enter,
+            on_leave_notify_event=self._on_leave,
         )
 
         self.content.add(self.button)
         self.add(self.content)
 
-        self.popup = LogoutPopup(parent=window, pointing_to=self)
+        self._popup = LazyPopup(
+            lambda: LogoutPopup(parent=window, pointing_to=self)
+        )
+
+    @property
+    def popup(self) -> LogoutPopup:
+        return self._popup.get()
+
+    def _on_enter(self, *_):
+        if self._popup.built:
+            self.popup.on_popup_enter()
+
+    def _on_leave(self, *_):
+        if self._popup.built:
+            self.popup.on_popup_leave()
 
     def _trigger_logout(self, *_):
         self.popup.toggle_popup()
@@ -2,14 +2,14 @@
 
 from collections import deque
 
-import psutil
-from gi.repository import GLib  # type: ignore
-
 from fabric.widgets.box import Box
 from fabric.widgets.eventbox import EventBox
 from fabric.widgets.label import Label
 from fabric.widgets.overlay import Overlay
-from utils.popup_manager import popup_manager
+from utils.popup_manager import HoverPopupController
+from utils.lazy_popup import LazyPopup
+from services.system_sampler import SystemSampler
+from utils.metric_history import metric_history
 from custom_widgets.animated_circular_progress_bar import AnimatedCircularProgressBar
 from modules.memory.memory_popup import MemoryPopup
 
@@ -51,85 +51,58 @@ class Memory(Box):
         self.add(self.content_event_box)
 
         # ── state ───────────────────────────────────────────────
+        # seeded from the persisted history so the graph survives restarts
         self._history: deque = deque(
-            [0.0] * self.HISTORY_LENGTH, maxlen=self.HISTORY_LENGTH
+            metric_history.recent("memory", self.HISTORY_LENGTH),
+            maxlen=self.HISTORY_LENGTH,
         )
 
-        self._hide_timeout_id = None
-        self._show_delay_id = None
-
         # ── popup ───────────────────────────────────────────────
-        self.popup = MemoryPopup(
-            parent=window,
-            pointing_to=self,
-            exclusivity="none",
+        self._window = window
+        self._popup = LazyPopup(self._build_popup)
+        self._hover = HoverPopupController(
+            self._popup,
+            on_show=self._fill_popup,
+            on_hide=self._on_popup_hidden,
+            unmap_delay=500,
         )
+        self._hover.attach(self.content_event_box)
 
-        self.content_event_box.connect("enter-notify-event", self._hover_trigger)
-        self.content_event_box.connect("leave-notify-event", self._on_hover_leave)
-        self.popup.connect("enter-notify-event", self._on_popup_enter)
-        self.popup.connect("leave-notify-event", self._on_popup_leave)
-
-        #self.popup.do_reposition("x")
-
-        # ── polling ─────────────────────────────────────────────
-        self._tick()
-        GLib.timeout_add(1000, self._tick)
+        # ── sampling (shared SystemSampler tick) ────────────────
+        self._sampler = SystemSampler()
+        self._sampler.connect("memory-sampled", self._on_memory_sampled)
 
     # ────────────────────────────────────────────────────────────
-    #  Hover / show / hide
+    #  Popup
     # ────────────────────────────────────────────────────────────
 
-    def _hover_trigger(self, *_):
-        self._show_delay_id = GLib.timeout_add(300, self._on_hover_enter)
-
-    def _on_hover_enter(self, *_):
-        self._cancel_hide_timeout()
-        self._show_delay_id = None
-
-        self.popup.update(self._history, self._build_stats_markup())
-        popup_manager.request_show(self.popup, self)
-
-        return False
+    @property
+    def popup(self) -> MemoryPopup:
+        return self._popup.get()
 
-    def _on_hover_leave(self, *_):
-        self._schedule_hide()
-        if self._show_delay_id:
-            GLib.source_remove(self._show_delay_id)
-            self._show_delay_id = None
-
-    def _on_popup_enter(self, *_):
-        self._cancel_hide_timeout()
-
-    def _on_popup_leave(self, *_):
-        self._schedule_hide()
-
-    def _schedule_hide(self):
-        self._cancel_hide_timeout()
-        self._hide_timeout_id = GLib.timeout_add(1000, self._hide_popup)
+    def _build_popup(self) -> MemoryPopup:
+        return MemoryPopup(
+            parent=self._window,
+            pointing_to=self,
+            exclusivity="none",
+        )
 
-    def _cancel_hide_timeout(self):
-        if self._hide_timeout_id:
-            GLib.source_remove(self._hide_timeout_id)
-            self._hide_timeout_id = None
+    def _fill_popup(self, popup):
+        # swap is only read while the popup is open
+        self._sampler.subscribe("memory", "popup")
+        popup.update(self._history, self._build_stats_markup())
 
-    def _hide_popup(self):
-        self.popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(500, self.popup.set_visible, False)
-        popup_manager.request_hide(self.popup, self)
-        self._hide_timeout_id = None
-        return False
+    def _on_popup_hidden(self):
+        self._sampler.unsubscribe("memory", "popup")
 
     # ────────────────────────────────────────────────────────────
     #  Data
     # ────────────────────────────────────────────────────────────
 
-    def get_memory_usage(self) -> float:
-        return psutil.virtual_memory().percent
-
     def _build_stats_markup(self) -> str:
-        ram = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        ram, swap = self._sampler.memory, self._sampler.swap
+        if ram is None or swap is None:
+            return "<b>Memory</b>"
 
         ram_color = (
             "#A3DC9A"
@@ -162,18 +135,16 @@ class Memory(Box):
         )
 
     # ────────────────────────────────────────────────────────────
-    #  Polling (every 500ms)
+    #  Sampling (SystemSampler, every 1 s)
     # ────────────────────────────────────────────────────────────
 
-    def _tick(self) -> bool:
-        value = self.get_memory_usage()
+    def _on_memory_sampled(self, _, snapshot):
+        value = snapshot.percent
         self._history.append(value)
 
         if abs(self.progress_bar.value - value) > 3:
             self.progress_bar.animate_value(value)
         self.progress_bar.set_value(value)
 
-        if self.popup.get_visible():
-            self.popup.update(self._history, self._build_stats_markup())
-
-        return True
+        if self._popup.visible:
+            self.popup.push(value, self._build_stats_markup())
@@ -14,6 +14,7 @@ from services.playerctlservice import SimplePlayerctlService
 from helpers.helper_functions import pixbuf_cropping_if_image_is_not_1_1
 
 from modules.mpris.mpris_popup import MprisPopup
+from utils.lazy_popup import LazyPopup
 
 
 class Mpris(Box):
@@ -53,14 +54,14 @@ class Mpris(Box):
         self.song_length = 0
         self.service = SimplePlayerctlService()
         self._init_widget_data()
-        self.overlay = MprisPopup(parent=window, pointing_to=self)
+        # the player stack stays subscribed to the shared playerctl manager,
+        # so it is built on first hover but never destroyed again
+        self._window = window
+        self._overlay = LazyPopup(self._build_overlay, idle_timeout=None)
 
         self.overlay_hide_timeout_id = None
-        self.overlay.connect("enter-notify-event", self._on_overlay_enter)
-        self.overlay.connect("leave-notify-event", self._on_overlay_leave)
         self.content_event_box.connect("enter-notify-event", self._hover_trigger)
         self.content_event_box.connect("leave-notify-event", self._on_hover_leave)
-        self.overlay.do_reposition("x")
 
         invoke_repeater(5000, self._update_progress)
 
@@ -82,6 +83,17 @@ class Mpris(Box):
 
         return True
 
+    @property
+    def overlay(self) -> MprisPopup:
+        return self._overlay.get()
+
+    def _build_overlay(self) -> MprisPopup:
+        overlay = MprisPopup(parent=self._window, pointing_to=self)
+        overlay.connect("enter-notify-event", self._on_overlay_enter)
+        overlay.connect("leave-notify-event", self._on_overlay_leave)
+        overlay.do_reposition("x")
+        return overlay
+
     def _hover_trigger(self):
         self.delay = GLib.timeout_add(300, self._on_hover_enter)
 
@@ -114,6 +126,9 @@ class Mpris(Box):
             self.overlay_hide_timeout_id = None
 
     def _hide_overlay(self):
+        if not self._overlay.built:
+            self.overlay_hide_timeout_id = None
+            return False
         self.overlay.overlay_revealer.set_reveal_child(False)
         GLib.timeout_add(250, self.overlay.set_visible, False)
         self.overlay_hide_timeout_id = None
@@ -137,7 +137,19 @@ class NetworkSpeedPopup(PopupWindow):
             self.download_graph.max_value = dl_max_mb
         if ul_max_mb > 0:
             self.upload_graph.max_value = ul_max_mb
-        self.download_graph.set_values(list(dl_history_mb))
-        self.upload_graph.set_values(list(ul_history_mb))
+        self.download_graph.set_values(dl_history_mb)
+        self.upload_graph.set_values(ul_history_mb)
+        self.set_processes_markup(processes_markup)
+
+    def push(self, dl_mb, ul_mb, dl_max_mb, ul_max_mb):
+        """Scroll one new sample into both graphs."""
+        if dl_max_mb > 0:
+            self.download_graph.max_value = dl_max_mb
+        if ul_max_mb > 0:
+            self.upload_graph.max_value = ul_max_mb
+        self.download_graph.push(dl_mb)
+        self.upload_graph.push(ul_mb)
+
+    def set_processes_markup(self, processes_markup):
         if processes_markup:
             self.processes_label.set_markup(processes_markup)
@@ -1,18 +1,92 @@
 """Service to manage brightness for both internal and external displays."""
 
 import os
+import shutil
 import subprocess
 import threading
 import time
 from gi.repository import GLib #type: ignore
 from fabric.core.service import Service, Signal
-from fabric import Fabricator
+from fabric.utils.helpers import monitor_file
+from loguru import logger
+
+from utils.procfs import ProcFile
+
+
+class DdcWriteQueue:
+    """Serialises ddcutil brightness writes to one I2C bus.
+
+    Only the latest requested value is kept while a write is in flight, so a
+    slider drag ends in one or two bus writes instead of one per event.
+    ``on_written(bus, value, latency, ok)`` is called from the worker thread
+    after every write, latency being seconds since that value was requested.
+    """
+
+    def __init__(self, bus: str, on_written=None):
+        self.bus = bus
+        self._on_written = on_written
+        self._lock = threading.Lock()
+        self._pending = None
+        self._running = False
+
+    @property
+    def busy(self) -> bool:
+        """True while a write is running or waiting."""
+        with self._lock:
+            return self._running
+
+    def submit(self, value: int):
+        """Queue *value*, replacing any write that has not started yet."""
+        with self._lock:
+            self._pending = (value, time.monotonic())
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._running = False
+                    return
+                value, requested_at = self._pending
+                self._pending = None
+
+            try:
+                ok = (
+                    subprocess.run(
+                        [
+                            "ddcutil",
+                            "setvcp",
+                            "10",
+                            str(value),
+                            "--bus",
+                            self.bus,
+                            "--sleep-multiplier",
+                            ".1",
+                        ],
+                        capture_output=True,
+                    ).returncode
+                    == 0
+                )
+            except OSError:
+                ok = False
+
+            if self._on_written is not None:
+                self._on_written(self.bus, value, time.monotonic() - requested_at, ok)
 
 
 class BrightnessService(Service):
     """Service to manage brightness for both internal and external displays."""
     _instance = None
 
+    # external monitors are polled quickly only for a short while after a
+    # user-initiated change, then the poller backs off to EXTERNAL_POLL_IDLE
+    EXTERNAL_POLL_FAST = 0.5
+    EXTERNAL_POLL_IDLE = 30.0
+    EXTERNAL_FAST_WINDOW = 5.0
+
     @Signal
     def changed(self, device_type: str, hardware_id: str, value: int) -> None:
         """Emitted when brightness changes. device_type is 'internal' or 'external'.
@@ -21,6 +95,13 @@ class BrightnessService(Service):
         """
         pass
 
+    @Signal
+    def external_written(self, bus: str, value: int, latency: float) -> None:
+        """Emitted when a ddcutil write finished; latency is in seconds
+        from the slider event to the completed bus write.
+        """
+        pass
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -35,20 +116,25 @@ class BrightnessService(Service):
         # Internal Backlight Setup
         self._internal_dev = self._find_internal_device()
         self._internal_path = f"/sys/class/backlight/{self._internal_dev}"
-        self._internal_val = self._get_sysfs_value()
+        self._internal_max = 0
+        self._actual_file = None
+        self._internal_val = self._open_internal()
 
         self._external_values = {}
         self._inhibit_polling = False
 
         # Your MSI monitor bus ID
         self.external_bus = "10"
+        self._write_queues: dict[str, DdcWriteQueue] = {}
 
-        # 1. Internal Poller (sysfs)
-        self._int_poller = Fabricator(poll_from=self._get_sysfs_value, interval=100)
-        self._int_poller.connect("changed", self._on_internal_poll)
+        # 1. Internal backlight: event driven, no polling
+        self._watch_internal()
 
-        # 2. External Poller Thread (Direct Bus)
-        threading.Thread(target=self._external_poll_loop, daemon=True).start()
+        # 2. External monitor: adaptive poller, woken up by set_brightness
+        self._external_wake = threading.Event()
+        self._external_fast_until = 0.0
+        if shutil.which("ddcutil"):
+            threading.Thread(target=self._external_poll_loop, daemon=True).start()
 
     def _find_internal_device(self):
         try:
@@ -56,48 +142,102 @@ class BrightnessService(Service):
         except:  # noqa: E722
             return "intel_backlight"
 
+    # ── internal backlight ──────────────────────────────────────
+
+    def _open_internal(self) -> int:
+        try:
+            max_file = ProcFile(f"{self._internal_path}/max_brightness", size=32)
+            self._internal_max = max_file.read_int()
+            max_file.close()
+            self._actual_file = ProcFile(
+                f"{self._internal_path}/actual_brightness", size=32
+            )
+        except OSError:
+            return 0
+        return self._get_sysfs_value()
+
     def _get_sysfs_value(self, *args) -> int:
         try:
-            with open(f"{self._internal_path}/max_brightness", "r") as f:
-                max_v = int(f.read())
-            with open(f"{self._internal_path}/actual_brightness", "r") as f:
-                act_v = int(f.read())
-            return round((act_v / max_v) * 100)
+            return round((self._actual_file.read_int() / self._internal_max) * 100)
         except:  # noqa: E722
             return 0
 
-    def _on_internal_poll(self, _, value):
-        # We removed the 'is_adjusting' check here
+    def _watch_internal(self):
+        if self._actual_file is None:
+            return
+        # userspace writes (brightnessctl, other tools) show up as inotify
+        # events on `brightness`
+        self._brightness_monitor = monitor_file(f"{self._internal_path}/brightness")
+        self._brightness_monitor.connect("changed", self._on_internal_event)
+        # firmware/hotkey changes are announced with sysfs_notify on
+        # `actual_brightness`, which wakes a POLLPRI watch on the open fd
+        GLib.io_add_watch(
+            self._actual_file.fileno(),
+            GLib.PRIORITY_DEFAULT,
+            GLib.IOCondition.PRI | GLib.IOCondition.ERR,
+            self._on_internal_event,
+        )
+
+    def _on_internal_event(self, *_):
+        # re-reading also re-arms the POLLPRI watch
+        value = self._get_sysfs_value()
         if value != self._internal_val:
             self._internal_val = value
             self.emit("changed", "internal", "internal", value)
+        return True
+
+    # ── external monitor (ddcutil) ──────────────────────────────
 
     def _external_poll_loop(self):
+        delay = 0.0
         while True:
-            # We only skip if Control Center is animating (inhibit)
-            # if self._inhibit_polling:
-            #     time.sleep(0.1)
-            #     continue
+            if self._external_wake.wait(delay):
+                # a user change just went out; give the write time to land
+                # before reading the bus back
+                self._external_wake.clear()
+                self._external_fast_until = time.monotonic() + self.EXTERNAL_FAST_WINDOW
+                delay = self.EXTERNAL_POLL_FAST
+                continue
 
-            try:
-                res = subprocess.run(
-                    ["ddcutil", "getvcp", "10", "--bus", self.external_bus, "--terse"],
-                    capture_output=True,
-                    text=True,  # Slightly longer timeout
-                    check=True,
+            queue = self._write_queues.get(self.external_bus)
+            if queue is not None and queue.busy:
+                # never read while our own writes are still using the bus
+                delay = self.EXTERNAL_POLL_FAST
+                continue
+
+            changed = self._read_external()
+            if changed or time.monotonic() < self._external_fast_until:
+                delay = self.EXTERNAL_POLL_FAST
+            else:
+                delay = min(
+                    max(delay, self.EXTERNAL_POLL_FAST) * 2, self.EXTERNAL_POLL_IDLE
                 )
-                if res.returncode == 0:
-                    parts = res.stdout.split()
-                    if len(parts) >= 4:
-                        val = int(parts[3])
-                        # Only emit if the hardware value actually changed from what we last saw
-                        if val != self._external_values.get(self.external_bus):
-                            self._external_values[self.external_bus] = val
-                            GLib.idle_add(self.emit, "changed", "external", "1", val)
-            except Exception:
-                pass
-
-            time.sleep(0.01)
+
+    def _read_external(self) -> bool:
+        """Read the external monitor once; True when its value changed."""
+        try:
+            res = subprocess.run(
+                ["ddcutil", "getvcp", "10", "--bus", self.external_bus, "--terse"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return False
+
+        parts = res.stdout.split()
+        if len(parts) < 4:
+            return False
+        try:
+            val = int(parts[3])
+        except ValueError:
+            return False
+        # Only emit if the hardware value actually changed from what we last saw
+        if val == self._external_values.get(self.external_bus):
+            return False
+        self._external_values[self.external_bus] = val
+        GLib.idle_add(self.emit, "changed", "external", "1", val)
+        return True
 
     def set_brightness(self, device_type: str, hardware_id: str, value: int):
         """Set brightness for a given device and emit the change immediately."""
@@ -107,22 +247,20 @@ class BrightnessService(Service):
             subprocess.Popen(["brightnessctl", "set", f"{value}%", "-q"])
         else:
             self._external_values[self.external_bus] = value
-            # Run the ddcutil set command in a background thread
-            threading.Thread(
-                target=lambda: subprocess.run(
-                    [
-                        "ddcutil",
-                        "setvcp",
-                        "10",
-                        str(value),
-                        "--bus",
-                        self.external_bus,
-                        "--sleep-multiplier",
-                        ".1",
-                    ]
-                ),
-                daemon=True,
-            ).start()
+            self._write_queue(self.external_bus).submit(value)
+            self._external_wake.set()
 
         # 2. Force emit the signal so the OSD pops up instantly
         self.emit("changed", device_type, hardware_id, value)
+
+    def _write_queue(self, bus: str) -> DdcWriteQueue:
+        if bus not in self._write_queues:
+            self._write_queues[bus] = DdcWriteQueue(bus, self._on_external_written)
+        return self._write_queues[bus]
+
+    def _on_external_written(self, bus: str, value: int, latency: float, ok: bool):
+        if not ok:
+            logger.warning(f"ddcutil could not set brightness {value} on bus {bus}")
+            return
+        logger.debug(f"brightness {value} written to bus {bus} in {latency * 1000:.0f} ms")
+        GLib.idle_add(self.emit, "external-written", bus, value, latency)
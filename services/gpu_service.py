@@ -0,0 +1,391 @@
+"""GPU statistics service with pluggable collection backends.
+
+Every backend produces ``devices_data``: a list of at most
+MAX_DEVICES_DISPLAYED dicts with the keys ``name``, ``gpu_util``,
+``used_gb``, ``vram_percent``, ``temp``, ``gpu_clock``, ``mem_clock``,
+``power`` and ``index``, which is exactly what GpuWidget renders.
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from gi.repository import GLib  # type: ignore
+from loguru import logger
+from fabric.core.service import Service, Signal
+
+from helpers.helper_functions import set_death_signal
+from utils.metric_history import metric_history
+from utils.procfs import ProcFile
+
+MAX_DEVICES_DISPLAYED = 3
+
+NVIDIA_QUERY_FIELDS = (
+    "count,index,name,utilization.gpu,memory.used,memory.total,"
+    "temperature.gpu,clocks.gr,clocks.mem,power.draw"
+)
+
+
+def parse_nvidia_csv_line(line: str) -> Optional[dict]:
+    """Parse one ``NVIDIA_QUERY_FIELDS`` CSV row into a device dict.
+
+    The GPU count is kept under ``count`` so a stream reader knows when a
+    sample is complete. Returns None for malformed rows.
+    """
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) != 10:
+        return None
+    try:
+        count = int(parts[0])
+        index = int(parts[1])
+        gpu_util = float(parts[3])
+        used_mib = float(parts[4])
+        total_mib = float(parts[5])
+    except ValueError:
+        return None
+
+    return {
+        "name": parts[2],
+        "gpu_util": gpu_util,
+        "used_gb": used_mib / 1024,
+        "vram_percent": (used_mib / total_mib) * 100 if total_mib else 0.0,
+        "temp": parts[6],
+        "gpu_clock": parts[7],
+        "mem_clock": parts[8],
+        "power": parts[9],
+        "index": index,
+        "count": count,
+    }
+
+
+class GpuBackend(ABC):
+    """Base class for GPU collectors.
+
+    ``start`` receives a callback that must be invoked on the main loop
+    with a fresh ``devices_data`` list every time a sample is ready.
+    """
+
+    @abstractmethod
+    def start(self, on_devices: Callable[[List[dict]], None]):
+        """Begin collecting and deliver samples to *on_devices*."""
+
+    @abstractmethod
+    def stop(self):
+        """Stop collecting and release any resources."""
+
+
+class NvidiaSmiBackend(GpuBackend):
+    """Streams samples from one long-running ``nvidia-smi --loop-ms`` process.
+
+    A single worker thread reads the CSV stream, so there is no fork/exec
+    or thread churn per sample. ``command`` can be replaced with any
+    program printing rows in the NVIDIA_QUERY_FIELDS layout (e.g. a fake
+    CSV producer for tests).
+
+    When the process exits before producing a sample (e.g. a driver/library
+    mismatch), the restart delay doubles each time, and collection stops
+    for good after MAX_FAILURES such exits in a row.
+    """
+
+    MAX_FAILURES = 5
+    MAX_RESTART_DELAY = 300.0
+
+    def __init__(
+        self,
+        interval_ms: int = 1000,
+        command: Optional[List[str]] = None,
+        restart_delay: float = 5.0,
+    ):
+        self.command = command or [
+            "nvidia-smi",
+            f"--query-gpu={NVIDIA_QUERY_FIELDS}",
+            "--format=csv,noheader,nounits",
+            f"--loop-ms={interval_ms}",
+        ]
+        self.restart_delay = restart_delay
+        self._on_devices: Optional[Callable[[List[dict]], None]] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = False
+        self._published = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        """True when the nvidia-smi binary is installed."""
+        return shutil.which("nvidia-smi") is not None
+
+    def start(self, on_devices):
+        self._on_devices = on_devices
+        self._stopped = False
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stopped = True
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+
+    def _run(self):
+        failures = 0
+        while not self._stopped:
+            try:
+                self._process = subprocess.Popen(
+                    self.command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                    preexec_fn=set_death_signal,
+                )
+            except OSError as e:
+                logger.error(f"could not start GPU collector {self.command[0]}: {e}")
+                return
+
+            published = self._published
+            self.consume(self._process.stdout)
+            self._process.wait()
+
+            if self._stopped:
+                return
+            # a run that produced samples was healthy; start counting afresh
+            failures = 0 if self._published > published else failures + 1
+            if failures >= self.MAX_FAILURES:
+                logger.error(
+                    f"GPU collector exited {failures} times in a row without "
+                    f"producing a sample (last status {self._process.returncode}), "
+                    "giving up"
+                )
+                return
+            delay = min(
+                self.restart_delay * 2 ** max(failures - 1, 0), self.MAX_RESTART_DELAY
+            )
+            logger.warning(
+                f"GPU collector exited with {self._process.returncode}, "
+                f"restarting in {delay:.0f}s"
+            )
+            time.sleep(delay)
+
+    def consume(self, lines: Iterable[str]):
+        """Group streamed rows into per-sample device lists and publish them."""
+        devices: List[dict] = []
+        for line in lines:
+            device = parse_nvidia_csv_line(line)
+            if device is None:
+                continue
+            if device["index"] == 0:
+                devices = []
+            if device["index"] < MAX_DEVICES_DISPLAYED:
+                devices.append(device)
+            if device["index"] == device["count"] - 1 and devices:
+                self._publish(devices)
+                devices = []
+
+    def _publish(self, devices: List[dict]):
+        self._published += 1
+        if self._on_devices is not None:
+            GLib.idle_add(self._deliver, devices)
+
+    def _deliver(self, devices):
+        if self._on_devices is not None and not self._stopped:
+            self._on_devices(devices)
+        return False
+
+
+class _SysfsCard:
+    """The attribute files of one DRM card, opened once and re-read with pread."""
+
+    VENDORS = {"0x1002": "AMD", "0x8086": "Intel", "0x10de": "NVIDIA"}
+
+    def __init__(self, card_path: str, index: int):
+        self.index = index
+        device = os.path.join(card_path, "device")
+        vendor = _read_text(os.path.join(device, "vendor"))
+        self.name = (
+            _read_text(os.path.join(device, "product_name"))
+            or f"{self.VENDORS.get(vendor, 'GPU')} {os.path.basename(card_path)}"
+        )
+
+        self.busy = _open_attribute(device, "gpu_busy_percent")
+        self.vram_used = _open_attribute(device, "mem_info_vram_used")
+        self.vram_total = _open_attribute(device, "mem_info_vram_total")
+        # intel exposes its current GT frequency on the card, not in hwmon
+        self.gt_freq = _open_attribute(card_path, "gt_cur_freq_mhz")
+
+        hwmon = _first_hwmon(device)
+        self.temp = _open_attribute(hwmon, "temp1_input")
+        self.sclk = _open_attribute(hwmon, "freq1_input")
+        self.mclk = _open_attribute(hwmon, "freq2_input")
+        self.power = _open_attribute(hwmon, "power1_average") or _open_attribute(
+            hwmon, "power1_input"
+        )
+
+    def sample(self) -> dict:
+        """Read every available attribute into a devices_data dict."""
+        used = _read_int(self.vram_used)
+        total = _read_int(self.vram_total)
+        temp = _read_int(self.temp)
+        sclk = _read_int(self.sclk)
+        mclk = _read_int(self.mclk)
+        power = _read_int(self.power)
+        if sclk is None:
+            gt_freq = _read_int(self.gt_freq)
+            sclk = gt_freq * 1_000_000 if gt_freq is not None else None
+
+        return {
+            "name": self.name,
+            "gpu_util": float(_read_int(self.busy) or 0),
+            "used_gb": (used or 0) / 1024**3,
+            "vram_percent": (used / total) * 100 if used is not None and total else 0.0,
+            "temp": f"{temp / 1000:.0f}" if temp is not None else "N/A",
+            "gpu_clock": f"{sclk / 1_000_000:.0f}" if sclk is not None else "N/A",
+            "mem_clock": f"{mclk / 1_000_000:.0f}" if mclk is not None else "N/A",
+            "power": f"{power / 1_000_000:.2f}" if power is not None else "N/A",
+            "index": self.index,
+        }
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _first_hwmon(device: str) -> Optional[str]:
+    root = os.path.join(device, "hwmon")
+    try:
+        entries = sorted(os.listdir(root))
+    except OSError:
+        return None
+    return os.path.join(root, entries[0]) if entries else None
+
+
+def _open_attribute(directory: Optional[str], name: str) -> Optional[ProcFile]:
+    if directory is None:
+        return None
+    try:
+        return ProcFile(os.path.join(directory, name), size=64, grow=False)
+    except OSError:
+        return None
+
+
+def _read_int(attribute: Optional[ProcFile]) -> Optional[int]:
+    if attribute is None:
+        return None
+    try:
+        return attribute.read_int()
+    except (OSError, ValueError):
+        # e.g. EBUSY/ENODEV while the GPU is in runtime suspend
+        return None
+
+
+class SysfsGpuBackend(GpuBackend):
+    """Reads AMD and Intel GPU stats from ``/sys/class/drm`` without a subprocess.
+
+    Attribute files are opened once and re-read with a positional read on a
+    main-loop timer; anything a driver does not expose shows up as ``N/A``.
+    ``root`` can point at a fake sysfs tree for testing.
+    """
+
+    CARD_PATTERN = re.compile(r"card\d+$")
+
+    def __init__(self, interval_ms: int = 1000, root: str = "/sys/class/drm"):
+        self.interval_ms = interval_ms
+        self.cards = [
+            _SysfsCard(os.path.join(root, name), index)
+            for index, name in enumerate(self.find_cards(root)[:MAX_DEVICES_DISPLAYED])
+        ]
+        self._on_devices: Optional[Callable[[List[dict]], None]] = None
+        self._source_id = None
+
+    @classmethod
+    def find_cards(cls, root: str = "/sys/class/drm") -> List[str]:
+        """Names of the DRM cards under *root* (connectors such as card0-DP-1 excluded)."""
+        try:
+            names = os.listdir(root)
+        except OSError:
+            return []
+        return sorted(
+            (name for name in names if cls.CARD_PATTERN.match(name)),
+            key=lambda name: int(name[4:]),
+        )
+
+    @classmethod
+    def is_available(cls, root: str = "/sys/class/drm") -> bool:
+        """True when at least one DRM card is present."""
+        return bool(cls.find_cards(root))
+
+    def start(self, on_devices):
+        self._on_devices = on_devices
+        self._source_id = GLib.timeout_add(self.interval_ms, self._poll)
+
+    def stop(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+    def sample(self) -> List[dict]:
+        """Read one devices_data list from every card."""
+        return [card.sample() for card in self.cards]
+
+    def _poll(self) -> bool:
+        if self._on_devices is not None and self.cards:
+            self._on_devices(self.sample())
+        return True
+
+
+def default_backend() -> Optional[GpuBackend]:
+    """Pick the best available backend for this machine, or None."""
+    if NvidiaSmiBackend.is_available():
+        return NvidiaSmiBackend()
+    if SysfsGpuBackend.is_available():
+        return SysfsGpuBackend()
+    return None
+
+
+class GpuService(Service):
+    """Publishes GPU samples from a pluggable backend.
+
+    Shared by every GpuWidget, so one collector runs per shell whatever the
+    number of bars.
+    """
+
+    _instance = None
+
+    @Signal
+    def updated(self, devices: object) -> None:
+        """Emitted with the latest devices_data list."""
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, backend: Optional[GpuBackend] = None, **kwargs):
+        if hasattr(self, "_initialized"):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self.devices: List[dict] = []
+        self._backend = backend or default_backend()
+        if self._backend is None:
+            logger.warning("no GPU backend available, GPU widget will stay idle")
+            return
+        self._backend.start(self._on_devices)
+
+    def _on_devices(self, devices: List[dict]):
+        self.devices = devices
+        if devices:
+            metric_history.record("gpu.core", devices[0]["gpu_util"])
+            metric_history.record("gpu.vram", devices[0]["vram_percent"])
+        self.emit("updated", devices)
+
+    def stop(self):
+        """Stop the underlying backend."""
+        if self._backend is not None:
+            self._backend.stop()
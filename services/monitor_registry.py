@@ -0,0 +1,129 @@
+"""Service that keeps track of the connected monitors through Hyprland IPC."""
+
+import json
+from dataclasses import dataclass
+
+from fabric.core.service import Service, Signal
+from fabric.hyprland.widgets import get_hyprland_connection
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class MonitorInfo:
+    """One monitor as reported by ``hyprctl monitors``."""
+
+    id: int
+    name: str
+    description: str = ""
+    width: int = 0
+    height: int = 0
+    x: int = 0
+    y: int = 0
+    scale: float = 1.0
+
+    @property
+    def is_internal(self) -> bool:
+        """True for the laptop panel (eDP connectors)."""
+        return "eDP" in self.name
+
+    @property
+    def brightness_target(self) -> tuple[str, str]:
+        """(device_type, hardware_id) as used by BrightnessService.
+
+        Hyprland IDs are 0, 1, 2... while ddcutil displays are usually
+        1, 2, 3..., so external monitors map to ``id + 1``.
+        """
+        if self.is_internal:
+            return "internal", "internal"
+        return "external", str(self.id + 1)
+
+
+class MonitorRegistry(Service):
+    """Current monitor layout, kept up to date from Hyprland events.
+
+    The monitor list is queried once over the Hyprland command socket and
+    refreshed only when the event socket reports a monitor being added or
+    removed, so no ``hyprctl`` process is ever spawned.
+    """
+
+    _instance = None
+
+    @Signal
+    def monitor_added(self, monitor: object) -> None:
+        """Emitted with the MonitorInfo of a newly connected monitor."""
+
+    @Signal
+    def monitor_removed(self, monitor: object) -> None:
+        """Emitted with the MonitorInfo of a disconnected monitor."""
+
+    @Signal
+    def changed(self) -> None:
+        """Emitted after every refresh that changed the monitor list."""
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if hasattr(self, "_initialized"):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._monitors: dict[int, MonitorInfo] = {}
+
+        self._conn = get_hyprland_connection()
+        for event in ("monitoradded", "monitoraddedv2", "monitorremoved"):
+            self._conn.connect(f"event::{event}", lambda *_: self.refresh())
+
+        if self._conn.ready:
+            self.refresh()
+        else:
+            self._conn.connect("event::ready", lambda *_: self.refresh())
+
+    @property
+    def monitors(self) -> list[MonitorInfo]:
+        """Connected monitors ordered by Hyprland ID."""
+        return [self._monitors[key] for key in sorted(self._monitors)]
+
+    def get(self, monitor_id: int) -> MonitorInfo | None:
+        """The monitor with Hyprland ID *monitor_id*, if connected."""
+        return self._monitors.get(monitor_id)
+
+    def refresh(self):
+        """Re-read the monitor list and emit the differences."""
+        if not self._conn.ready:
+            return
+        try:
+            reply = self._conn.send_command("j/monitors").reply.decode()
+            monitors = {
+                m["id"]: MonitorInfo(
+                    id=m["id"],
+                    name=m.get("name", ""),
+                    description=m.get("description", ""),
+                    width=m.get("width", 0),
+                    height=m.get("height", 0),
+                    x=m.get("x", 0),
+                    y=m.get("y", 0),
+                    scale=m.get("scale", 1.0),
+                )
+                for m in json.loads(reply)
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Monitor detection failed: {e}")
+            return
+
+        previous = self._monitors
+        self._monitors = monitors
+
+        removed = [previous[key] for key in previous.keys() - monitors.keys()]
+        added = [monitors[key] for key in monitors.keys() - previous.keys()]
+        for monitor in removed:
+            self.emit("monitor-removed", monitor)
+        for monitor in added:
+            self.emit("monitor-added", monitor)
+        if added or removed or any(
+            previous[key] != monitors[key] for key in previous.keys() & monitors.keys()
+        ):
+            self.emit("changed")
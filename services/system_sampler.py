@@ -0,0 +1,455 @@
+"""Service that samples every system metric shown in the bar in one aligned pass."""
+
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+
+import psutil
+from gi.repository import GLib  # type: ignore
+from fabric.core.service import Service, Signal
+from loguru import logger
+
+from utils.metric_history import metric_history
+from utils.process_index import process_index
+from utils.procfs import CpuStatReader, MemInfoReader, NetDevReader, open_hwmon_input
+from utils.sock_diag import ProcessTrafficMeter
+
+
+@dataclass(frozen=True)
+class CpuSnapshot:
+    """Total and per-core CPU usage at one sample point."""
+
+    percent: float
+    per_core: tuple[float, ...] = ()
+
+
+@dataclass(frozen=True)
+class CpuDetailsSnapshot:
+    """CPU clock, temperature and fan speed; only sampled for the popup."""
+
+    frequency: float  # MHz
+    temperature: float  # °C
+    fan_speed: int  # RPM
+
+
+@dataclass(frozen=True)
+class MemorySnapshot:
+    """RAM usage at one sample point (sizes in bytes)."""
+
+    percent: float
+    used: int
+    total: int
+    available: int
+
+
+@dataclass(frozen=True)
+class SwapSnapshot:
+    """Swap usage at one sample point (sizes in bytes)."""
+
+    percent: float
+    used: int
+    total: int
+
+
+@dataclass(frozen=True)
+class NetworkSnapshot:
+    """Total network throughput since the previous network sample."""
+
+    download_bytes: int
+    upload_bytes: int
+    interval: float
+
+    @property
+    def download_rate(self) -> float:
+        """Download speed in bytes per second."""
+        return self.download_bytes / self.interval if self.interval > 0 else 0.0
+
+    @property
+    def upload_rate(self) -> float:
+        """Upload speed in bytes per second."""
+        return self.upload_bytes / self.interval if self.interval > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class DiskSnapshot:
+    """Usage of a single mount point (sizes in bytes)."""
+
+    path: str
+    used: int
+    total: int
+    free: int
+
+    @property
+    def percent(self) -> float:
+        """Used space in percent of the total."""
+        return (self.used / self.total) * 100 if self.total else 0.0
+
+
+@dataclass(frozen=True)
+class NetworkProcess:
+    """TCP throughput of one process since the previous network sample."""
+
+    pid: int
+    name: str
+    download_rate: float  # bytes per second
+    upload_rate: float  # bytes per second
+
+
+@dataclass(frozen=True)
+class BatterySnapshot:
+    """Battery state as reported by psutil."""
+
+    percent: float
+    power_plugged: bool
+    secsleft: int
+
+
+class SystemSampler(Service):
+    """Samples CPU, memory, network, disk and battery on one shared timer.
+
+    Every metric is read in a single batched pass per tick and published as a
+    typed snapshot, so the bar wakes up once per second instead of once per
+    widget, and every widget sees values taken at the same instant.
+
+    Metrics are collected in tiers. The "bar" tier always runs; the
+    "popup" and "deep" probes of a metric only run while at least one
+    consumer is subscribed to them (see :meth:`subscribe`), so details
+    that only a popup shows cost nothing while every popup is closed.
+    """
+
+    _instance = None
+
+    # how many ticks pass between two samples of each metric
+    PERIODS = {
+        "cpu": 1,
+        "memory": 1,
+        "network": 2,
+        "disk": 10,
+        "battery": 10,
+    }
+
+    TIERS = ("bar", "popup", "deep")
+
+    # probes that only run while someone is subscribed to (metric, tier);
+    # they run before the metric's bar sample, so its listeners see both
+    PROBES = {
+        ("cpu", "popup"): "_probe_cpu_details",
+        ("memory", "popup"): "_probe_swap",
+        ("disk", "popup"): "_probe_partitions",
+        ("network", "deep"): "_probe_network_processes",
+    }
+
+    DISK_PATH = "/"
+
+    # (hwmon chip, attribute) of the CPU temperature and fan sensors
+    CPU_TEMP_SENSOR = ("coretemp", "temp1_input")
+    CPU_FAN_SENSOR = ("asus", "fan1_input")
+
+    @Signal
+    def cpu_sampled(self, snapshot: object) -> None:
+        """Emitted with a CpuSnapshot."""
+
+    @Signal
+    def cpu_details_sampled(self, snapshot: object) -> None:
+        """Emitted with a CpuDetailsSnapshot, or None without sensors."""
+
+    @Signal
+    def memory_sampled(self, snapshot: object) -> None:
+        """Emitted with a MemorySnapshot."""
+
+    @Signal
+    def swap_sampled(self, snapshot: object) -> None:
+        """Emitted with a SwapSnapshot."""
+
+    @Signal
+    def network_sampled(self, snapshot: object) -> None:
+        """Emitted with a NetworkSnapshot."""
+
+    @Signal
+    def network_processes_sampled(self, processes: object) -> None:
+        """Emitted with a tuple of NetworkProcess, busiest first."""
+
+    @Signal
+    def disk_sampled(self, snapshot: object) -> None:
+        """Emitted with a DiskSnapshot."""
+
+    @Signal
+    def partitions_sampled(self, snapshots: object) -> None:
+        """Emitted with a tuple of DiskSnapshot, DISK_PATH first."""
+
+    @Signal
+    def battery_sampled(self, snapshot: object) -> None:
+        """Emitted with a BatterySnapshot, or None when there is no battery."""
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, interval: int = 1, **kwargs):
+        if hasattr(self, "_initialized"):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._interval = interval
+        self._tick_count = 0
+        self._last_net_counters: tuple[int, int, float] | None = None
+
+        # hot files stay open for the whole session (see utils/procfs.py)
+        self._cpu_reader = CpuStatReader()
+        self._memory_reader = MemInfoReader()
+        self._network_reader = NetDevReader()
+
+        # hwmon sensors are opened on the first popup subscription
+        self._temp_input = None
+        self._fan_input = None
+        self._sensors_opened = False
+
+        # (metric, tier) -> number of subscribed consumers
+        self._subscribers: dict[tuple[str, str], int] = {}
+        self._process_scan_running = False
+        self._traffic_meter: ProcessTrafficMeter | None = None
+        self._traffic_meter_failed = False
+
+        # latest snapshots, so late subscribers can render immediately
+        self.cpu: CpuSnapshot | None = None
+        self.memory: MemorySnapshot | None = None
+        self.network: NetworkSnapshot | None = None
+        self.disk: DiskSnapshot | None = None
+        self.battery: BatterySnapshot | None = None
+        self.cpu_details: CpuDetailsSnapshot | None = None
+        self.swap: SwapSnapshot | None = None
+        self.partitions: tuple[DiskSnapshot, ...] = ()
+        self.network_processes: tuple[NetworkProcess, ...] = ()
+
+        # first pass runs once the widgets constructed alongside us are connected
+        GLib.idle_add(self._first_pass)
+        GLib.timeout_add_seconds(self._interval, self._tick)
+
+    def period(self, metric: str) -> int:
+        """Seconds between two samples of *metric*."""
+        return self.PERIODS[metric] * self._interval
+
+    # ── subscriptions ───────────────────────────────────────────
+
+    def subscribe(self, metric: str, tier: str = "popup"):
+        """Start the *tier* probes of *metric* for one more consumer.
+
+        The first subscriber triggers an immediate probe, so a popup that
+        subscribes right before showing already has data to render.
+        """
+        self._check_tier(metric, tier)
+        if tier == "bar":
+            return
+        key = (metric, tier)
+        self._subscribers[key] = self._subscribers.get(key, 0) + 1
+        if self._subscribers[key] == 1 and key in self.PROBES:
+            getattr(self, self.PROBES[key])()
+
+    def unsubscribe(self, metric: str, tier: str = "popup"):
+        """Drop one consumer added with :meth:`subscribe`."""
+        self._check_tier(metric, tier)
+        key = (metric, tier)
+        count = self._subscribers.get(key, 0) - 1
+        if count > 0:
+            self._subscribers[key] = count
+            return
+        self._subscribers.pop(key, None)
+        if key == ("network", "deep"):
+            # names are only needed while the process list is shown; don't
+            # keep a pidfd watch per process on the main loop after that
+            process_index.clear()
+
+    def is_subscribed(self, metric: str, tier: str) -> bool:
+        """True if the *tier* probes of *metric* are currently running."""
+        return tier == "bar" or self._subscribers.get((metric, tier), 0) > 0
+
+    def _check_tier(self, metric: str, tier: str):
+        if metric not in self.PERIODS:
+            raise ValueError(f"unknown metric {metric!r}")
+        if tier not in self.TIERS:
+            raise ValueError(f"unknown tier {tier!r}")
+
+    # ── scheduling ──────────────────────────────────────────────
+
+    def _first_pass(self) -> bool:
+        self._sample(list(self.PERIODS))
+        return False
+
+    def _tick(self) -> bool:
+        self._tick_count += 1
+        self._sample(
+            [
+                metric
+                for metric, period in self.PERIODS.items()
+                if self._tick_count % period == 0
+            ]
+        )
+        return True
+
+    def _sample(self, metrics: list[str]):
+        for metric in metrics:
+            for (probed, tier), probe in self.PROBES.items():
+                if probed == metric and self.is_subscribed(probed, tier):
+                    getattr(self, probe)()
+            getattr(self, f"_sample_{metric}")()
+
+    # ── readers ─────────────────────────────────────────────────
+
+    def _sample_cpu(self):
+        percent, per_core = self._cpu_reader.sample()
+        self.cpu = CpuSnapshot(percent=percent, per_core=tuple(per_core))
+        metric_history.record("cpu", percent)
+        self.emit("cpu-sampled", self.cpu)
+
+    def _sample_memory(self):
+        percent, used, total, available = self._memory_reader.sample()
+        self.memory = MemorySnapshot(
+            percent=percent,
+            used=used,
+            total=total,
+            available=available,
+        )
+        metric_history.record("memory", percent)
+        self.emit("memory-sampled", self.memory)
+
+    def _sample_network(self):
+        bytes_recv, bytes_sent = self._network_reader.sample()
+        now = time.monotonic()
+        previous = self._last_net_counters
+        self._last_net_counters = (bytes_recv, bytes_sent, now)
+
+        # the very first read only establishes the baseline
+        if previous is None:
+            return
+
+        # counters shrink when an interface disappears; treat that as idle
+        self.network = NetworkSnapshot(
+            download_bytes=max(0, bytes_recv - previous[0]),
+            upload_bytes=max(0, bytes_sent - previous[1]),
+            interval=now - previous[2],
+        )
+        metric_history.record("network.download", self.network.download_rate)
+        metric_history.record("network.upload", self.network.upload_rate)
+        self.emit("network-sampled", self.network)
+
+    def _sample_disk(self):
+        usage = shutil.disk_usage(self.DISK_PATH)
+        self.disk = DiskSnapshot(
+            path=self.DISK_PATH,
+            used=usage.used,
+            total=usage.total,
+            free=usage.free,
+        )
+        self.emit("disk-sampled", self.disk)
+
+    def _sample_battery(self):
+        battery = psutil.sensors_battery()
+        self.battery = (
+            BatterySnapshot(
+                percent=battery.percent,
+                power_plugged=battery.power_plugged,
+                secsleft=battery.secsleft,
+            )
+            if battery
+            else None
+        )
+        self.emit("battery-sampled", self.battery)
+
+    # ── popup / deep probes ─────────────────────────────────────
+
+    def _probe_cpu_details(self):
+        if not self._sensors_opened:
+            # kept open instead of walking all of hwmon through
+            # psutil.sensors_temperatures() on every refresh
+            self._temp_input = open_hwmon_input(*self.CPU_TEMP_SENSOR)
+            self._fan_input = open_hwmon_input(*self.CPU_FAN_SENSOR)
+            self._sensors_opened = True
+
+        details = None
+        if self._temp_input is not None and self._fan_input is not None:
+            try:
+                details = CpuDetailsSnapshot(
+                    frequency=psutil.cpu_freq().current,
+                    temperature=self._temp_input.read_int() / 1000,
+                    fan_speed=self._fan_input.read_int(),
+                )
+            except (OSError, ValueError, AttributeError):
+                pass
+        self.cpu_details = details
+        self.emit("cpu-details-sampled", self.cpu_details)
+
+    def _probe_swap(self):
+        swap = psutil.swap_memory()
+        self.swap = SwapSnapshot(percent=swap.percent, used=swap.used, total=swap.total)
+        self.emit("swap-sampled", self.swap)
+
+    def _probe_partitions(self):
+        mounts = [self.DISK_PATH] + [
+            part.mountpoint
+            for part in psutil.disk_partitions(all=False)
+            if part.mountpoint != self.DISK_PATH
+        ]
+        snapshots = []
+        for mount in mounts:
+            try:
+                usage = shutil.disk_usage(mount)
+            except OSError:
+                continue
+            snapshots.append(
+                DiskSnapshot(
+                    path=mount,
+                    used=usage.used,
+                    total=usage.total,
+                    free=usage.free,
+                )
+            )
+        self.partitions = tuple(snapshots)
+        self.emit("partitions-sampled", self.partitions)
+
+    def _probe_network_processes(self):
+        # the first sample after a while can walk /proc/<pid>/fd, so keep
+        # it off the main loop
+        if self._process_scan_running or self._traffic_meter_failed:
+            return
+        self._process_scan_running = True
+        threading.Thread(target=self._scan_network_processes, daemon=True).start()
+
+    def _scan_network_processes(self):
+        try:
+            if self._traffic_meter is None:
+                self._traffic_meter = ProcessTrafficMeter()
+            traffic, interval = self._traffic_meter.sample()
+        except OSError as e:
+            logger.warning(f"Per-process network accounting unavailable: {e}")
+            self._traffic_meter_failed = True
+            GLib.idle_add(self._publish_network_processes, ())
+            return
+
+        # after the popup was closed for a while the counters only give a
+        # long-term average; use that sample as a fresh baseline instead
+        if interval <= 0 or interval > 3 * self.PERIODS["network"] * self._interval:
+            traffic = {}
+
+        processes = [
+            NetworkProcess(
+                pid=pid,
+                name=process_index.name(pid),
+                download_rate=received / interval,
+                upload_rate=sent / interval,
+            )
+            for pid, (sent, received) in traffic.items()
+        ]
+        processes.sort(key=lambda p: p.download_rate + p.upload_rate, reverse=True)
+        GLib.idle_add(self._publish_network_processes, tuple(processes))
+
+    def _publish_network_processes(self, processes):
+        self._process_scan_running = False
+        if not self.is_subscribed("network", "deep"):
+            # the popup closed while this scan was running
+            process_index.clear()
+        self.network_processes = processes
+        self.emit("network-processes-sampled", self.network_processes)
+        return False
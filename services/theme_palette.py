@@ -0,0 +1,129 @@
+"""Service that holds the colours defined in styles/colors.css."""
+
+import colorsys
+import re
+
+from fabric.core.service import Service, Signal
+from fabric.utils import get_relative_path
+from loguru import logger
+
+COLORS_CSS = get_relative_path("../styles/colors.css")
+
+Rgba = tuple[float, float, float, float]
+
+_VARIABLE = re.compile(r"--([\w-]+)\s*:\s*([^;]+);")
+_HEX = re.compile(r"#([0-9a-fA-F]{6})([0-9a-fA-F]{2})?")
+_CALL = re.compile(r"(\w+)\((.*)\)$")
+
+
+def _shade(rgba: Rgba, factor: float) -> Rgba:
+    """GTK's shade(): scale lightness and saturation by *factor*."""
+    hue, light, sat = colorsys.rgb_to_hls(*rgba[:3])
+    red, green, blue = colorsys.hls_to_rgb(
+        hue, min(light * factor, 1.0), min(sat * factor, 1.0)
+    )
+    return red, green, blue, rgba[3]
+
+
+def parse_color(value: str) -> Rgba | None:
+    """A colours.css value as RGBA floats.
+
+    Understands ``#rrggbb[aa]`` and the GTK colour functions the theme
+    selector writes (``darker``, ``lighter``, ``shade``, ``alpha``).
+    Anything else gives None.
+    """
+    value = value.strip()
+    call = _CALL.match(value)
+    if call is None:
+        match = _HEX.fullmatch(value)
+        if match is None:
+            return None
+        digits, alpha = match.groups()
+        red, green, blue = (int(digits[i : i + 2], 16) / 255 for i in (0, 2, 4))
+        return red, green, blue, int(alpha, 16) / 255 if alpha else 1.0
+
+    name, args = call.groups()
+    if name in ("shade", "alpha"):
+        inner, _, extra = args.rpartition(",")
+    else:
+        inner, extra = args, ""
+    rgba = parse_color(inner)
+    if rgba is None:
+        return None
+    try:
+        if name == "darker":
+            return _shade(rgba, 0.7)
+        if name == "lighter":
+            return _shade(rgba, 1.3)
+        if name == "shade":
+            return _shade(rgba, float(extra))
+        if name == "alpha":
+            return (*rgba[:3], rgba[3] * float(extra))
+    except ValueError:
+        pass
+    return None
+
+
+def to_hex(rgba: Rgba) -> str:
+    """``#rrggbb`` for Pango markup; alpha is dropped."""
+    return "#" + "".join(f"{round(c * 255):02x}" for c in rgba[:3])
+
+
+class ThemePalette(Service):
+    """The theme colours, parsed once per change of colors.css.
+
+    Widgets that draw with theme colours themselves read them from here
+    instead of opening the stylesheet, and connect to ``changed`` to
+    redraw. ``start_shell`` calls :meth:`reload` from the file monitor it
+    already keeps on colors.css.
+    """
+
+    _instance = None
+
+    @Signal
+    def changed(self) -> None:
+        """Emitted after a reload that changed any colour."""
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if hasattr(self, "_initialized"):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._colors: dict[str, Rgba] = {}
+        self.reload()
+
+    def rgba(self, name: str, default: Rgba) -> Rgba:
+        """Colour ``--name`` as RGBA floats, or *default* if undefined."""
+        return self._colors.get(name, default)
+
+    def hex(self, name: str, default: str) -> str:
+        """Colour ``--name`` as ``#rrggbb``, or *default* if undefined."""
+        rgba = self._colors.get(name)
+        return to_hex(rgba) if rgba is not None else default
+
+    def reload(self):
+        """Re-read colors.css and emit ``changed`` if a colour changed."""
+        try:
+            with open(COLORS_CSS, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError as e:
+            logger.warning(f"could not read {COLORS_CSS}: {e}")
+            return
+
+        colors = {}
+        for name, value in _VARIABLE.findall(content):
+            rgba = parse_color(value)
+            if rgba is not None:
+                colors[name] = rgba
+        # the file is rewritten in several steps, so skip the empty states
+        if not colors or colors == self._colors:
+            return
+        self._colors = colors
+        logger.debug(f"theme palette reloaded with {len(colors)} colours")
+        self.emit("changed")
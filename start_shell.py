@@ -12,10 +12,13 @@ from loguru import logger
 from modules.control_center import control_center
 from modules.notification.notification_window import NotificationPopupWindow
 from modules.tab_alt_overview.windows_overview import AltTab
+from services.monitor_registry import MonitorRegistry
 from services.networkservice import NetworkService
 from services.notification_service import NotificationService
 from services.playerctlservice import SimplePlayerctlService
+from services.theme_palette import ThemePalette
 from utils.application_data_holder import Data
+from utils.metric_history import metric_history
 from widgets.brightness_osd import BrightnessOSD  # This now uses the new Service
 from widgets.corners import ScreenCorners
 from widgets.theme_selector import ThemeSelector
@@ -24,6 +27,39 @@ from widgets.volume_osd import VolumeOSD
 from widgets.wallpaper_selector import WallpaperSelector
 
 
+def side_monitor_windows(monitor_id: int) -> list:
+    """Corners and brightness OSD for a monitor that has no bar."""
+    return [
+        ScreenCorners(monitor=monitor_id),
+        # It will automatically detect if this monitor is eDP (internal) or external
+        BrightnessOSD(monitor_id=monitor_id),
+    ]
+
+
+def follow_side_monitors(app: Application, side_windows: dict, primary_monitor: int):
+    """Add and remove side monitor windows as monitors are plugged in or out."""
+    registry = MonitorRegistry()
+
+    def on_added(_, monitor):
+        if monitor.id == primary_monitor or monitor.id in side_windows:
+            return
+        logger.info(f"Adding windows for monitor {monitor.id} ({monitor.name})")
+        side_windows[monitor.id] = side_monitor_windows(monitor.id)
+        for window in side_windows[monitor.id]:
+            app.add_window(window)
+
+    def on_removed(_, monitor):
+        windows = side_windows.pop(monitor.id, [])
+        if windows:
+            logger.info(f"Removing windows for monitor {monitor.id} ({monitor.name})")
+        for window in windows:
+            app.remove_window(window)
+            window.destroy()
+
+    registry.connect("monitor-added", on_added)
+    registry.connect("monitor-removed", on_removed)
+
+
 def main():
     """Entry point for the application."""
     setproctitle.setproctitle("hypr-fabric-bar-main")
@@ -35,6 +71,8 @@ def main():
         level="INFO",
     )
 
+    metric_history.autosave()
+
     app_data = Data(
         notification_service=NotificationService(),
         playerctl_service=SimplePlayerctlService(),
@@ -52,6 +90,15 @@ def main():
     # Updated: Passing monitor_id so it can detect if it's internal or external
     brightness_osd = BrightnessOSD(monitor_id=primary_monitor)
 
+    # every other monitor gets corners + OSD in this same process, sharing
+    # all services with the primary one
+    registry = MonitorRegistry()
+    side_windows = {
+        monitor.id: side_monitor_windows(monitor.id)
+        for monitor in registry.monitors
+        if monitor.id != primary_monitor
+    }
+
     wallpaper_selector = WallpaperSelector()
     theme_selector = ThemeSelector()
 
@@ -66,9 +113,11 @@ def main():
             brightness_osd,
             wallpaper_selector,
             theme_selector,
-            alttab
+            alttab,
+            *(window for windows in side_windows.values() for window in windows),
         ],
     )
+    follow_side_monitors(app, side_windows, primary_monitor)
 
     @Application.action()
     def toggle_wallpaper_selector():
@@ -110,6 +159,7 @@ def main():
             lambda *a: (
                 app.set_stylesheet_from_file(style_path),
                 app.set_stylesheet_from_file(get_relative_path("styles/style.css")),
+                ThemePalette().reload(),
             ),
         )
     app.run()
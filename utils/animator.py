@@ -4,7 +4,7 @@ over time based on a given timing function."""
 # Author: Yousef EL-Darsh
 # License (SPDX): AGPL-3.0-or-later
 
-from functools import cache
+from functools import lru_cache
 from typing import Protocol, cast
 from fabric.core.service import Service, Property, Signal
 from fabric.utils import clamp
@@ -12,20 +12,21 @@ from fabric.utils import clamp
 from gi.repository import GLib, Gtk  # type: ignore
 
 
-@cache
+# resolution of the per-curve lookup table used by _cubic_bezier
+_BEZIER_TABLE_SIZE = 256
+
+
 def _lerp(start: float, end: float, progress: float) -> float:
     return start + (end - start) * progress
 
 
-@cache
 def _steps(n: int, progress: float, start_jump: bool = False) -> float:
     if start_jump:
         return min(int(progress * n), n - 1) / (n - 1) if n > 1 else 0.0
     return min(int(progress * n + 1e-10), n) / n
 
 
-@cache
-def _cubic_bezier(
+def _solve_cubic_bezier(
     x1: float, y1: float, x2: float, y2: float, progress: float, epsilon=1e-6
 ) -> float:
     # implementation yanked off of the internet, don't blame me about anything.
@@ -60,6 +61,34 @@ def _cubic_bezier(
     return 3 * y1 * omt * omt * t + 3 * y2 * omt * t_sq + t * t_sq
 
 
+@lru_cache(maxsize=32)
+def _cubic_bezier_table(
+    x1: float, y1: float, x2: float, y2: float
+) -> tuple[float, ...]:
+    """Solve the curve once at evenly spaced progress values.
+
+    Keyed by the curve parameters only, so the cache holds one small table
+    per distinct curve instead of one entry per animation frame.
+    """
+    return tuple(
+        _solve_cubic_bezier(x1, y1, x2, y2, i / _BEZIER_TABLE_SIZE)
+        for i in range(_BEZIER_TABLE_SIZE + 1)
+    )
+
+
+def _cubic_bezier(x1: float, y1: float, x2: float, y2: float, progress: float) -> float:
+    table = _cubic_bezier_table(x1, y1, x2, y2)
+    position = clamp(progress, 0.0, 1.0) * _BEZIER_TABLE_SIZE
+    index = int(position)
+    if index >= _BEZIER_TABLE_SIZE:
+        return table[_BEZIER_TABLE_SIZE]
+    if index in (0, _BEZIER_TABLE_SIZE - 1):
+        # curves with vertical end tangents are too steep to interpolate here
+        return _solve_cubic_bezier(x1, y1, x2, y2, progress)
+    low = table[index]
+    return low + (table[index + 1] - low) * (position - index)
+
+
 def _ease_linear(progress: float) -> float:
     return _cubic_bezier(1, 1, 0, 0, progress)
 
@@ -82,6 +111,105 @@ class TimingFunctionCallback(Protocol):
     def __call__(self, progress: float, *args, **kwargs) -> float: ...
 
 
+class _AnimationScheduler:
+    """Drives every playing Animator from as few callbacks as possible.
+
+    Animators whose tick widget is realized are grouped by the widget's
+    Gdk.FrameClock and advanced together from a single "update" handler per
+    clock, which is disconnected again once the last animation on it stops.
+    Like ``add_tick_callback``, an animator whose widget is not realized
+    does not tick; it joins the widget's clock on "realize" and leaves it
+    again on "unrealize". Animators without a tick widget use a GLib
+    timeout instead.
+    """
+
+    def __init__(self):
+        # Gdk.FrameClock -> (update handler id, animators ticking on it)
+        self._clocks: dict = {}
+        # Animator -> [Gdk.FrameClock, GLib timeout source id or None,
+        #              tick widget, its realize/unrealize handler ids]
+        self._animators: dict = {}
+
+    @property
+    def active_count(self) -> int:
+        """Number of animations currently playing."""
+        return len(self._animators)
+
+    def attach(self, animator: "Animator", widget: Gtk.Widget | None):
+        """Start ticking *animator*; returns a handle for Animator to keep."""
+        if widget is None:
+            handle = GLib.timeout_add(animator._tick_interval, animator.do_handle_tick)
+            self._animators[animator] = [handle, None, ()]
+            return handle
+
+        handlers = (
+            widget.connect("realize", self._on_realize, animator),
+            widget.connect("unrealize", self._on_unrealize, animator),
+        )
+        self._animators[animator] = [None, widget, handlers]
+        clock = widget.get_frame_clock()
+        if clock is not None:
+            self._join(animator, clock)
+        return widget
+
+    def detach(self, animator: "Animator"):
+        """Stop ticking *animator*."""
+        entry = self._animators.pop(animator, None)
+        if entry is None:
+            return
+        handle, widget, handlers = entry
+        if widget is None:
+            GLib.source_remove(handle)
+            return
+        for handler_id in handlers:
+            widget.disconnect(handler_id)
+        if handle is not None:
+            self._leave(animator, handle)
+
+    def _join(self, animator: "Animator", clock):
+        if clock not in self._clocks:
+            self._clocks[clock] = (clock.connect("update", self._on_update), set())
+            clock.begin_updating()
+        self._clocks[clock][1].add(animator)
+        self._animators[animator][0] = clock
+
+    def _leave(self, animator: "Animator", clock):
+        handler_id, animators = self._clocks[clock]
+        animators.discard(animator)
+        if animators:
+            return
+        del self._clocks[clock]
+        clock.disconnect(handler_id)
+        clock.end_updating()
+
+    def _on_realize(self, widget, animator):
+        entry = self._animators.get(animator)
+        clock = widget.get_frame_clock()
+        if entry is None or clock is None or entry[0] is clock:
+            return
+        if entry[0] is not None:
+            self._leave(animator, entry[0])
+        self._join(animator, clock)
+
+    def _on_unrealize(self, _widget, animator):
+        entry = self._animators.get(animator)
+        if entry is None or entry[0] is None:
+            return
+        self._leave(animator, entry[0])
+        entry[0] = None
+
+    def _on_update(self, clock):
+        if clock not in self._clocks:
+            return
+        # copy: animators detach themselves when they finish
+        for animator in tuple(self._clocks[clock][1]):
+            animator.do_handle_tick()
+
+
+# module-level singleton shared by every Animator
+animation_scheduler = _AnimationScheduler()
+
+
 class Animator(Service):
     """
     An animator is a simple way for animating a value on
@@ -245,14 +373,11 @@ class Animator(Service):
         return True
 
     def do_remove_tick_handlers(self):
-        """Remove the tick handler from the tick widget or GLib timeout."""
+        """Detach the animation from the shared animation scheduler."""
         if not self._tick_handler:
             return
 
-        if self._tick_widget:
-            self._tick_widget.remove_tick_callback(self._tick_handler)
-        else:
-            GLib.source_remove(self._tick_handler)
+        animation_scheduler.detach(self)
         self._tick_handler = None
         return
 
@@ -267,13 +392,7 @@ class Animator(Service):
         if self._tick_handler:
             return
 
-        if self._tick_widget:
-            self._tick_handler = self._tick_widget.add_tick_callback(
-                self.do_handle_tick
-            )
-            return
-
-        self._tick_handler = GLib.timeout_add(self._tick_interval, self.do_handle_tick)
+        self._tick_handler = animation_scheduler.attach(self, self._tick_widget)
         return
 
     def pause(self):
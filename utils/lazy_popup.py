@@ -0,0 +1,69 @@
+"""Deferred construction of hover popups."""
+
+from typing import Callable, Optional
+
+from gi.repository import GLib  # type: ignore
+from loguru import logger
+
+# popups that stay hidden this long are destroyed and rebuilt on the next
+# hover; None keeps them alive once built
+POPUP_IDLE_TIMEOUT_MS: Optional[int] = 5 * 60 * 1000
+
+
+class LazyPopup:
+    """Builds a popup window on first use instead of at bar startup.
+
+    ``factory`` is called with no arguments the first time :meth:`get` is
+    used and must return the popup with its signals already connected.
+    Once the popup has been hidden for ``idle_timeout`` ms it is destroyed
+    again, so rarely opened popups do not keep a layer-shell window and its
+    widget tree around for the whole session.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        idle_timeout: Optional[int] = POPUP_IDLE_TIMEOUT_MS,
+    ):
+        self._factory = factory
+        self._idle_timeout = idle_timeout
+        self._popup = None
+        self._destroy_id = None
+
+    @property
+    def built(self) -> bool:
+        """True while the popup window exists."""
+        return self._popup is not None
+
+    @property
+    def visible(self) -> bool:
+        """True if the popup exists and is shown; never builds it."""
+        return self._popup is not None and self._popup.get_visible()
+
+    def get(self):
+        """The popup, built on the first call."""
+        if self._popup is None:
+            self._popup = self._factory()
+            self._popup.connect("show", self._on_show)
+            self._popup.connect("hide", self._on_hide)
+            logger.debug(f"built {type(self._popup).__name__}")
+        return self._popup
+
+    def _on_show(self, *_):
+        if self._destroy_id:
+            GLib.source_remove(self._destroy_id)
+            self._destroy_id = None
+
+    def _on_hide(self, *_):
+        if self._idle_timeout is None or self._destroy_id:
+            return
+        self._destroy_id = GLib.timeout_add(self._idle_timeout, self._destroy)
+
+    def _destroy(self):
+        self._destroy_id = None
+        if self._popup is None or self._popup.get_visible():
+            return False
+        logger.debug(f"destroying idle {type(self._popup).__name__}")
+        popup, self._popup = self._popup, None
+        popup.destroy()
+        return False
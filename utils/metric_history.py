@@ -0,0 +1,462 @@
+"""Long-range history of the bar's metrics at several resolutions.
+
+Every series keeps float32 rings of min/avg/max per bucket:
+
+    1 s  buckets for 10 minutes   (600)
+    10 s buckets for 6 hours     (2160)
+    1 min buckets for 7 days    (10080)
+
+Each raw sample is folded into the open bucket of every tier, so the coarser
+tiers are exact aggregates of the samples they cover. Closed buckets are
+written straight into a memory-mapped file, ``~/.cache/fabric-bar/metrics.bin``,
+so a restarted bar attaches to its whole history without parsing anything
+and other local tools can read it without IPC (see MetricsFileReader).
+
+File layout (little endian, fixed for a given version):
+
+    header      magic "FBMB", version, tier count, series capacity,
+                series count, generation (u64)
+    tier table  (resolution, capacity) per tier
+    series      name (32 bytes), data offset, then per tier
+                (last bucket, head, count)
+    data        per series, per tier: avg, min, max float32 rings
+
+``generation`` is a sequence lock: the bar makes it odd before it touches
+the file and even again afterwards. Readers retry while it is odd or when it
+changed under them, and an odd value at attach time means the bar died in
+the middle of a write.
+"""
+
+import atexit
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from gi.repository import GLib  # type: ignore
+from loguru import logger
+
+# (bucket length in seconds, number of buckets)
+TIERS: Tuple[Tuple[int, int], ...] = ((1, 600), (10, 2160), (60, 10080))
+MAX_SERIES = 16
+
+METRICS_PATH = os.path.expanduser("~/.cache/fabric-bar/metrics.bin")
+
+_MAGIC = b"FBMB"
+_VERSION = 1
+# magic, version, tier count, series capacity, series count, generation
+_HEADER = struct.Struct("<4sIIIIQ")
+_COUNT = struct.Struct("<I")
+_COUNT_OFFSET = 16
+_GENERATION = struct.Struct("<Q")
+_GENERATION_OFFSET = 20
+_TIER_INFO = struct.Struct("<II")  # resolution, capacity
+_SERIES_NAME = struct.Struct("<32sQ")  # utf-8 name (NUL padded), data offset
+_TIER_META = struct.Struct("<qII")  # last bucket, head, count
+_KINDS = ("avg", "min", "max")
+
+
+def _layout(tiers=TIERS, max_series: int = MAX_SERIES) -> Tuple[int, int, int, int]:
+    """Return (series table offset, series entry size, data offset, series data size)."""
+    table = _HEADER.size + len(tiers) * _TIER_INFO.size
+    entry = _SERIES_NAME.size + len(tiers) * _TIER_META.size
+    data = table + max_series * entry
+    series_size = sum(len(_KINDS) * 4 * capacity for _, capacity in tiers)
+    return table, entry, data, series_size
+
+
+def _write_entry(buffer, offset: int, name: str, data_offset: int):
+    """Write an empty series table entry."""
+    _SERIES_NAME.pack_into(buffer, offset, name.encode()[:32], data_offset)
+    for i in range(len(TIERS)):
+        _TIER_META.pack_into(
+            buffer, offset + _SERIES_NAME.size + i * _TIER_META.size, -1, 0, 0
+        )
+
+
+class _Tier:
+    """One resolution of a series: min/avg/max rings plus the open bucket.
+
+    The rings and their (last bucket, head, count) record live in the shared
+    buffer; the open bucket only exists in memory until it closes.
+    """
+
+    def __init__(self, resolution, capacity, buffer, meta_offset, data_offset):
+        self.resolution = resolution
+        self.capacity = capacity
+        self._buffer = buffer
+        self._meta_offset = meta_offset
+
+        size = 4 * capacity
+        rings = memoryview(buffer)[data_offset : data_offset + 3 * size]
+        self.avg = rings[:size].cast("f")
+        self.min = rings[size : 2 * size].cast("f")
+        self.max = rings[2 * size :].cast("f")
+
+        self.last_bucket, self.head, self.count = _TIER_META.unpack_from(
+            buffer, meta_offset
+        )
+        if not 0 <= self.head < capacity or not 0 <= self.count <= capacity:
+            self.last_bucket, self.head, self.count = -1, 0, 0
+
+        # open (not yet closed) bucket
+        self._bucket = self.last_bucket
+        self._sum = 0.0
+        self._n = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, value: float, timestamp: float):
+        bucket = int(timestamp // self.resolution)
+        if bucket != self._bucket:
+            self._close()
+            self._bucket = bucket
+        self._sum += value
+        self._n += 1
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def _close(self):
+        if self._n == 0:
+            return
+        # buckets without samples (bar not running) are stored as NaN
+        if self.last_bucket >= 0:
+            gap = min(self._bucket - self.last_bucket - 1, self.capacity)
+            for _ in range(max(gap, 0)):
+                self._write(math.nan, math.nan, math.nan)
+        self._write(self._sum / self._n, self._min, self._max)
+        self.last_bucket = self._bucket
+        # slots are written before the record that publishes them, so a
+        # crash in between only loses the newest bucket
+        _TIER_META.pack_into(
+            self._buffer, self._meta_offset, self.last_bucket, self.head, self.count
+        )
+        self._sum, self._n = 0.0, 0
+        self._min, self._max = math.inf, -math.inf
+
+    def _write(self, avg: float, lo: float, hi: float):
+        self.avg[self.head] = avg
+        self.min[self.head] = lo
+        self.max[self.head] = hi
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    @property
+    def newest_bucket(self) -> int:
+        """Bucket number of the newest value last() returns (-1 if none)."""
+        return self._bucket if self._n > 0 else self.last_bucket
+
+    def last(self, count: int, kind: str = "avg") -> List[float]:
+        """The newest *count* buckets (oldest first), including the open one."""
+        ring = getattr(self, kind)
+        pending = self._n > 0
+        stored = min(count - pending, self.count)
+        start = (self.head - stored) % self.capacity
+        if start + stored <= self.capacity:
+            values = ring[start : start + stored].tolist()
+        else:
+            values = ring[start:].tolist() + ring[: self.head].tolist()
+        if pending:
+            values.append(
+                {"avg": self._sum / self._n, "min": self._min, "max": self._max}[kind]
+            )
+        return values
+
+
+class MetricSeries:
+    """All tiers of one metric, backed by one slot of the metrics buffer."""
+
+    def __init__(self, name: str, buffer, entry_offset: int, data_offset: int):
+        self.name = name
+        self.tiers = []
+        for i, (resolution, capacity) in enumerate(TIERS):
+            self.tiers.append(
+                _Tier(
+                    resolution,
+                    capacity,
+                    buffer,
+                    entry_offset + _SERIES_NAME.size + i * _TIER_META.size,
+                    data_offset,
+                )
+            )
+            data_offset += len(_KINDS) * 4 * capacity
+
+    def add(self, value: float, timestamp: Optional[float] = None):
+        """Fold one raw sample into every tier."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for tier in self.tiers:
+            tier.add(value, timestamp)
+
+    def tier_for(self, seconds: float) -> _Tier:
+        """The finest tier that covers the last *seconds*."""
+        for tier in self.tiers:
+            if tier.resolution * tier.capacity >= seconds:
+                return tier
+        return self.tiers[-1]
+
+    def range(self, seconds: float, kind: str = "avg") -> List[float]:
+        """Values covering the last *seconds* from the best fitting tier."""
+        tier = self.tier_for(seconds)
+        return tier.last(max(1, int(seconds // tier.resolution)), kind)
+
+
+class MetricHistory:
+    """Store of every metric series, living in the memory-mapped ``path``."""
+
+    SYNC_INTERVAL = 60  # seconds between msync calls
+
+    def __init__(self, path: str = METRICS_PATH):
+        self.path = path
+        self._series: Dict[str, MetricSeries] = {}
+        self._buffer = None
+        self._sync_source = None
+
+    def series(self, name: str) -> MetricSeries:
+        """The series called *name*, allocated in the file on first use."""
+        if self._buffer is None:
+            self._attach()
+        if name not in self._series:
+            self._series[name] = self._allocate(name)
+        return self._series[name]
+
+    def record(self, name: str, value: float, timestamp: Optional[float] = None):
+        """Add one sample to the series called *name*."""
+        entry = self.series(name)
+        self._begin_write()
+        try:
+            entry.add(value, timestamp)
+        finally:
+            self._end_write()
+
+    def recent(
+        self, name: str, count: int, default: float = 0.0, step: int = 1
+    ) -> List[float]:
+        """The averages of the last *count* steps of *step* seconds, skipping
+        empty steps and padded with *default* at the front (e.g. to seed a
+        widget's deque).
+
+        *step* should be the metric's sampling period, so a series recorded
+        every 2 s gives one value per sample rather than every other
+        one-second bucket being empty. Only buckets within ``count * step``
+        seconds of now are used, so history left over from before a restart
+        or a suspend is not shown as recent.
+        """
+        tier = self.series(name).tiers[0]
+        span = count * step
+        values = tier.last(span)
+        # buckets are contiguous up to the newest one
+        first = tier.newest_bucket - len(values) + 1
+        oldest = int(time.time() // tier.resolution) - span + 1
+
+        sums = [0.0] * count
+        counts = [0] * count
+        for bucket, value in enumerate(values, first):
+            slot = (bucket - oldest) // step
+            if bucket < oldest or slot >= count or math.isnan(value):
+                continue
+            sums[slot] += value
+            counts[slot] += 1
+        values = [total / n for total, n in zip(sums, counts) if n]
+        return [default] * (count - len(values)) + values
+
+    # ── file ────────────────────────────────────────────────────
+
+    def autosave(self):
+        """Flush the map to disk every SYNC_INTERVAL seconds and at exit.
+
+        Samples reach the page cache as soon as they are recorded, so they
+        already survive a crash of the bar; this only bounds what a power
+        loss can take away.
+        """
+        if self._sync_source is None:
+            self._sync_source = GLib.timeout_add_seconds(
+                self.SYNC_INTERVAL, lambda: self.sync() or True
+            )
+            atexit.register(self.sync)
+
+    def sync(self):
+        """Write dirty pages of the metrics file back to disk."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.flush()
+
+    def _attach(self):
+        table, entry_size, data, series_size = _layout()
+        size = data + MAX_SERIES * series_size
+        try:
+            self._buffer = self._map_file(size)
+        except OSError as e:
+            logger.warning(f"metrics file {self.path} unavailable, history stays in memory: {e}")
+            self._buffer = bytearray(size)
+            self._initialise()
+            return
+
+        magic, version, tiers, capacity, count, generation = _HEADER.unpack_from(
+            self._buffer, 0
+        )
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or tiers != len(TIERS)
+            or capacity != MAX_SERIES
+            or self._tier_table() != list(TIERS)
+        ):
+            self._initialise()
+            return
+
+        if generation % 2:
+            logger.warning(f"{self.path}: the previous session died mid-write")
+            _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, generation + 1)
+
+        # zero parse: the series just point into the mapped rings
+        for index in range(min(count, MAX_SERIES)):
+            offset = table + index * entry_size
+            raw_name, data_offset = _SERIES_NAME.unpack_from(self._buffer, offset)
+            name = raw_name.rstrip(b"\0").decode(errors="replace")
+            self._series[name] = MetricSeries(name, self._buffer, offset, data_offset)
+
+    def _map_file(self, size: int) -> mmap.mmap:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            if os.fstat(fd).st_size != size:
+                # new or foreign file: start over with a zeroed (sparse) one
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            return mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _tier_table(self) -> List[Tuple[int, int]]:
+        return [
+            _TIER_INFO.unpack_from(self._buffer, _HEADER.size + i * _TIER_INFO.size)
+            for i in range(len(TIERS))
+        ]
+
+    def _initialise(self):
+        self._buffer[:] = bytes(len(self._buffer))
+        _HEADER.pack_into(
+            self._buffer, 0, _MAGIC, _VERSION, len(TIERS), MAX_SERIES, 0, 0
+        )
+        for i, tier in enumerate(TIERS):
+            _TIER_INFO.pack_into(self._buffer, _HEADER.size + i * _TIER_INFO.size, *tier)
+        self._series.clear()
+
+    def _allocate(self, name: str) -> MetricSeries:
+        table, entry_size, data, series_size = _layout()
+        index = len(self._series)
+        if index >= MAX_SERIES:
+            logger.warning(f"metrics file is full, {name} will not be persisted")
+            buffer = bytearray(entry_size + series_size)
+            _write_entry(buffer, 0, name, entry_size)
+            return MetricSeries(name, buffer, 0, entry_size)
+
+        offset = table + index * entry_size
+        data_offset = data + index * series_size
+        self._begin_write()
+        try:
+            _write_entry(self._buffer, offset, name, data_offset)
+            _COUNT.pack_into(self._buffer, _COUNT_OFFSET, index + 1)
+        finally:
+            self._end_write()
+        return MetricSeries(name, self._buffer, offset, data_offset)
+
+    def _begin_write(self):
+        (generation,) = _GENERATION.unpack_from(self._buffer, _GENERATION_OFFSET)
+        _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, generation | 1)
+
+    def _end_write(self):
+        (generation,) = _GENERATION.unpack_from(self._buffer, _GENERATION_OFFSET)
+        _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, generation + 1)
+
+
+class TornReadError(RuntimeError):
+    """The metrics file stayed mid-write for every retry of a read.
+
+    Either the bar is writing unusually slowly or, if the generation is
+    odd, a bar died in the middle of a write and left the file torn.
+    """
+
+
+class MetricsFileReader:
+    """Read-only view of the metrics file of a running (or past) bar.
+
+    Meant for other local tools: the file is mapped read-only and every read
+    is retried until it did not overlap a write, at most READ_RETRIES
+    times (about 1 ms apart) before TornReadError is raised.
+    """
+
+    READ_RETRIES = 50
+
+    def __init__(self, path: str = METRICS_PATH):
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, version, tiers, capacity, _, _ = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a metrics file")
+        self.tiers = [
+            _TIER_INFO.unpack_from(self._map, _HEADER.size + i * _TIER_INFO.size)
+            for i in range(tiers)
+        ]
+        self._capacity = capacity
+
+    def names(self) -> List[str]:
+        """Names of the series in the file."""
+        return list(self._consistent(self._index))
+
+    def values(self, name: str, tier: int = 0, kind: str = "avg") -> List[float]:
+        """All stored buckets of one ring, oldest first (NaN = no data)."""
+        return self._consistent(lambda: self._ring(name, tier, kind))
+
+    def _consistent(self, read):
+        for _ in range(self.READ_RETRIES):
+            (before,) = _GENERATION.unpack_from(self._map, _GENERATION_OFFSET)
+            if before % 2 == 0:
+                result = read()
+                (after,) = _GENERATION.unpack_from(self._map, _GENERATION_OFFSET)
+                if before == after:
+                    return result
+            time.sleep(0.001)
+        raise TornReadError(
+            f"metrics file still mid-write after {self.READ_RETRIES} attempts "
+            f"(generation {before})"
+        )
+
+    def _index(self) -> Dict[str, Tuple[int, int]]:
+        table, entry_size, _, _ = _layout(self.tiers, self._capacity)
+        (count,) = _COUNT.unpack_from(self._map, _COUNT_OFFSET)
+        index = {}
+        for i in range(min(count, self._capacity)):
+            offset = table + i * entry_size
+            raw_name, data_offset = _SERIES_NAME.unpack_from(self._map, offset)
+            index[raw_name.rstrip(b"\0").decode(errors="replace")] = (offset, data_offset)
+        return index
+
+    def _ring(self, name: str, tier: int, kind: str) -> List[float]:
+        entry_offset, data_offset = self._index()[name]
+        for _, capacity in self.tiers[:tier]:
+            data_offset += len(_KINDS) * 4 * capacity
+        capacity = self.tiers[tier][1]
+        _, head, count = _TIER_META.unpack_from(
+            self._map, entry_offset + _SERIES_NAME.size + tier * _TIER_META.size
+        )
+        start = data_offset + _KINDS.index(kind) * 4 * capacity
+        with memoryview(self._map)[start : start + 4 * capacity] as raw:
+            ring = raw.cast("f")
+            first = (head - count) % capacity
+            if first + count <= capacity:
+                values = ring[first : first + count].tolist()
+            else:
+                values = ring[first:].tolist() + ring[:head].tolist()
+            ring.release()
+        return values
+
+
+metric_history = MetricHistory()
@@ -1,8 +1,6 @@
 """Utility functions for monitor detection and information retrieval."""
 
-import json
-import subprocess
-from loguru import logger
+from services.monitor_registry import MonitorRegistry
 
 
 def get_monitor_info(monitor_id: int):
@@ -10,25 +8,9 @@ def get_monitor_info(monitor_id: int):
     Returns (device_type, hardware_id)
     Internal: ("internal", "internal")
     External: ("external", "1") -> "1" is the ddcutil display index
+    Unknown monitors (e.g. before Hyprland answered) count as internal.
     """
-    try:
-        output = subprocess.check_output(["hyprctl", "monitors", "-j"], text=True)
-        monitors = json.loads(output)
-        target_mon = next((m for m in monitors if m["id"] == monitor_id), None)
-
-        if not target_mon:
-            return "internal", "internal"
-
-        if "eDP" in target_mon["name"]:
-            return "internal", "internal"
-
-        # Logic for multiple external monitors:
-        # Hyprland IDs are 0, 1, 2... ddcutil displays are usually 1, 2, 3...
-        # We find the display index by matching the model name if possible,
-        # or fallback to a calculated index.
-        display_index = str(monitor_id + 1)
-        return "external", display_index
-
-    except Exception as e: #type: ignore
-        logger.error(f"Monitor detection failed: {e}")
+    monitor = MonitorRegistry().get(monitor_id)
+    if monitor is None:
         return "internal", "internal"
+    return monitor.brightness_target
@@ -1,6 +1,13 @@
-"""Singleton that ensures only one popup is visible at a time."""
+"""Singleton that ensures only one popup is visible at a time, plus the
+hover controller every bar widget uses to drive its popup."""
 
-from gi.repository import GLib #type: ignore
+import time
+from typing import Callable, Optional
+
+from gi.repository import GLib  # type: ignore
+from loguru import logger
+
+from utils.lazy_popup import LazyPopup
 
 
 class _PopupManager:
@@ -8,23 +15,23 @@ class _PopupManager:
 
     def __init__(self):
         self._current_popup = None
-        self._current_widget = None  # the bar widget that owns the current popup
+        self._current_widget = None  # the controller that owns the current popup
 
     def request_show(self, popup, owner):
-        """Called by a widget when it wants to show its popup.
+        """Called by a controller when it wants to show its popup.
 
         If a different popup is already visible, hide it first.
 
         Args:
             popup: The PopupWindow to show.
-            owner: The bar widget (Cpu, Memory, etc.) that owns this popup.
+            owner: The HoverPopupController that owns this popup.
         """
         if self._current_popup is popup:
             return  # already showing — nothing to do
 
         # hide the previous popup immediately
         if self._current_popup is not None and self._current_popup.get_visible():
-            self._hide(self._current_popup, self._current_widget)
+            self._current_widget.dismiss()
 
         popup.set_visible(True)
         popup.overlay_revealer.set_reveal_child(True)
@@ -38,14 +45,141 @@ class _PopupManager:
             self._current_popup = None
             self._current_widget = None
 
-    @staticmethod
-    def _hide(popup, owner):
-        popup.overlay_revealer.set_reveal_child(False)
-        GLib.timeout_add(250, popup.set_visible, False)
-        # also cancel any pending hide timeout on the owner
-        if hasattr(owner, "_cancel_hide_timeout"):
-            owner._cancel_hide_timeout()
-
 
 # module-level singleton — every widget imports this same instance
 popup_manager = _PopupManager()
+
+
+class HoverPopupController:
+    """Show/hide state machine for one bar widget and its hover popup.
+
+    Hovering the bar widget shows the popup after ``show_delay`` ms; leaving
+    the widget or the popup hides it ``hide_delay`` ms later, and the window
+    is unmapped ``unmap_delay`` ms after the revealer starts closing. Each
+    of the three timers has at most one pending GLib source, so hover
+    flicker never stacks up wakeups.
+
+    ``on_show(popup)`` runs right before the popup is shown and is the place
+    to fill it with fresh data; ``on_hide()`` runs when it starts hiding.
+    """
+
+    def __init__(
+        self,
+        popup: LazyPopup,
+        *,
+        on_show: Optional[Callable] = None,
+        on_hide: Optional[Callable] = None,
+        show_delay: int = 300,
+        hide_delay: int = 1000,
+        unmap_delay: int = 250,
+    ):
+        self._popup = popup
+        self._on_show = on_show
+        self._on_hide = on_hide
+        self._show_delay = show_delay
+        self._hide_delay = hide_delay
+        self._unmap_delay = unmap_delay
+
+        self._show_id = None
+        self._hide_id = None
+        self._unmap_id = None
+        self._connected = None  # popup instance our handlers are attached to
+        self._active = False
+
+        # seconds from the show delay expiring to the popup being mapped,
+        # including building it on a cold start
+        self.show_latency: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        """True from showing the popup until it starts hiding."""
+        return self._active
+
+    def attach(self, *widgets):
+        """Drive the popup from hovering any of *widgets*."""
+        for widget in widgets:
+            widget.connect("enter-notify-event", self.hover_enter)
+            widget.connect("leave-notify-event", self.hover_leave)
+
+    # ── hover events ────────────────────────────────────────────
+
+    def hover_enter(self, *_):
+        # moving between children of the widget shouldn't close the popup
+        self._cancel("_hide_id")
+        if self._active or self._show_id:
+            return
+        self._show_id = GLib.timeout_add(self._show_delay, self._show)
+
+    def hover_leave(self, *_):
+        self._cancel("_show_id")
+        self._schedule_hide()
+
+    def _on_popup_enter(self, *_):
+        self._cancel("_hide_id")
+
+    def _on_popup_leave(self, *_):
+        self._schedule_hide()
+
+    # ── show / hide ─────────────────────────────────────────────
+
+    def _show(self):
+        self._show_id = None
+        started = time.perf_counter()
+        cold = not self._popup.built
+
+        popup = self._popup.get()
+        if popup is not self._connected:
+            popup.connect("enter-notify-event", self._on_popup_enter)
+            popup.connect("leave-notify-event", self._on_popup_leave)
+            self._connected = popup
+
+        # a hide that is still closing the revealer must not unmap us
+        self._cancel("_unmap_id")
+        if self._on_show is not None:
+            self._on_show(popup)
+        popup_manager.request_show(popup, self)
+        self._active = True
+
+        self.show_latency = time.perf_counter() - started
+        logger.debug(
+            f"{type(popup).__name__} shown in {self.show_latency * 1000:.1f} ms"
+            f"{' (built)' if cold else ''}"
+        )
+        return False
+
+    def _schedule_hide(self):
+        self._cancel("_hide_id")
+        self._hide_id = GLib.timeout_add(self._hide_delay, self._hide)
+
+    def _hide(self):
+        self._hide_id = None
+        self.dismiss()
+        return False
+
+    def dismiss(self):
+        """Hide the popup now and drop every pending timer."""
+        self._cancel("_show_id")
+        self._cancel("_hide_id")
+        if not self._popup.built:
+            return
+        popup = self._popup.get()
+        if self._active and self._on_hide is not None:
+            self._on_hide()
+        self._active = False
+
+        popup.overlay_revealer.set_reveal_child(False)
+        if not self._unmap_id:
+            self._unmap_id = GLib.timeout_add(self._unmap_delay, self._unmap)
+        popup_manager.request_hide(popup, self)
+
+    def _unmap(self):
+        self._unmap_id = None
+        if self._popup.built:
+            self._popup.get().set_visible(False)
+        return False
+
+    def _cancel(self, attr: str):
+        source = getattr(self, attr)
+        if source:
+            GLib.source_remove(source)
+            setattr(self, attr, None)
@@ -0,0 +1,160 @@
+"""Shared cache of process names and command lines."""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from gi.repository import GLib  # type: ignore
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """Identity of one process; (pid, start_time) never repeats."""
+
+    pid: int
+    start_time: int  # clock ticks after boot, field 22 of /proc/<pid>/stat
+    name: str
+    cmdline: tuple[str, ...]
+
+
+def _read_stat(pid: int) -> tuple[str, int]:
+    """(comm, start time) from /proc/<pid>/stat."""
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        data = f.read()
+    # comm may itself contain spaces and parentheses
+    head, _, rest = data.rpartition(b")")
+    name = head.partition(b"(")[2].decode(errors="replace")
+    return name, int(rest.split()[19])
+
+
+def _read_cmdline(pid: int) -> tuple[str, ...]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            data = f.read()
+    except OSError:
+        return ()
+    return tuple(arg.decode(errors="replace") for arg in data.split(b"\0") if arg)
+
+
+class ProcessIndex:
+    """Process names and command lines, read once per process lifetime.
+
+    Entries are keyed by ``(pid, start time)``, so a recycled pid never
+    returns the previous owner's name. Where the kernel supports pidfds,
+    every cached process is watched through one, and its entry is dropped
+    as soon as it exits; otherwise the start time is re-checked on lookup.
+    Safe to use from worker threads.
+    """
+
+    MAX_ENTRIES = 512
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # pid -> (ProcessInfo, pidfd or -1, GLib source id or 0)
+        self._entries: OrderedDict = OrderedDict()
+        self._pidfd = hasattr(os, "pidfd_open")
+
+    def get(self, pid: int) -> Optional[ProcessInfo]:
+        """The process currently running as *pid*, or None if it is gone."""
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None and entry[1] >= 0:
+                self._entries.move_to_end(pid)
+                return entry[0]
+
+        if entry is not None:
+            # no pidfd: the start time tells whether the pid was recycled
+            try:
+                if _read_stat(pid)[1] == entry[0].start_time:
+                    return entry[0]
+            except (OSError, ValueError, IndexError):
+                pass
+            self.forget(pid)
+
+        return self._load(pid)
+
+    def name(self, pid: int) -> str:
+        """The process name of *pid*, or the pid itself if it is gone."""
+        info = self.get(pid)
+        return info.name if info is not None else str(pid)
+
+    def forget(self, pid: int):
+        """Drop the cached entry for *pid*."""
+        with self._lock:
+            entry = self._entries.pop(pid, None)
+        if entry is not None:
+            self._release(entry)
+
+    def clear(self):
+        """Drop every entry and stop watching the processes."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._release(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, pid: int) -> Optional[ProcessInfo]:
+        # open the pidfd first: whatever we read afterwards belongs to the
+        # process it refers to, even if the pid was recycled just before
+        pidfd = -1
+        if self._pidfd:
+            try:
+                pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                return None
+            except OSError:
+                self._pidfd = False  # ENOSYS / seccomp: fall back for good
+
+        try:
+            name, start_time = _read_stat(pid)
+        except (OSError, ValueError, IndexError):
+            if pidfd >= 0:
+                os.close(pidfd)
+            return None
+        info = ProcessInfo(pid, start_time, name, _read_cmdline(pid))
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(pid, None)
+            if previous is not None:
+                evicted.append(previous)
+            source = 0
+            if pidfd >= 0:
+                # a pidfd becomes readable once the process exits. The watch
+                # is added under the lock, so even if the process is already
+                # gone, _on_exit only runs once its entry is in place
+                source = GLib.io_add_watch(
+                    pidfd, GLib.PRIORITY_LOW, GLib.IOCondition.IN, self._on_exit, pid
+                )
+            self._entries[pid] = (info, pidfd, source)
+            while len(self._entries) > self.MAX_ENTRIES:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for entry in evicted:
+            self._release(entry)
+        return info
+
+    def _on_exit(self, pidfd, _condition, pid):
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is None or entry[1] != pidfd:
+                return False
+            del self._entries[pid]
+        os.close(pidfd)
+        return False
+
+    @staticmethod
+    def _release(entry):
+        _, pidfd, source = entry
+        if source:
+            GLib.source_remove(source)
+        if pidfd >= 0:
+            os.close(pidfd)
+
+
+# module-level singleton shared by every consumer
+process_index = ProcessIndex()
@@ -0,0 +1,205 @@
+"""Low-overhead readers for the /proc and /sys files the bar polls every tick.
+
+Each reader opens its file once, keeps the descriptor for the whole session
+and re-reads it with a positional read at offset 0 into a preallocated
+buffer. Only the fields the bar actually shows are parsed.
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+
+class ProcFile:
+    """A /proc or /sys file kept open and re-read in place."""
+
+    def __init__(self, path: str, size: int = 4096, grow: bool = True):
+        """
+        Args:
+            path (str): file to keep open.
+            size (int, optional): initial buffer size in bytes. Defaults to 4096.
+            grow (bool, optional): grow the buffer until the whole file fits.
+                Disable for files where only the head is interesting
+                (e.g. /proc/stat). Defaults to True.
+        """
+        self.path = path
+        self.length = 0
+        self._fd = -1
+        self._fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        self._buf = bytearray(size)
+        self._grow = grow
+
+    def read(self) -> bytearray:
+        """Re-read the file and return the shared buffer.
+
+        Only the first ``self.length`` bytes are valid, and the buffer is
+        overwritten by the next call.
+        """
+        while True:
+            self.length = os.preadv(self._fd, [self._buf], 0)
+            if not self._grow or self.length < len(self._buf):
+                return self._buf
+            self._buf = bytearray(len(self._buf) * 2)
+
+    def read_int(self) -> int:
+        """Read a file holding a single integer (most sysfs attributes)."""
+        buf = self.read()
+        return int(buf[: self.length])
+
+    def fileno(self) -> int:
+        """The underlying descriptor, e.g. for a POLLPRI watch on sysfs."""
+        return self._fd
+
+    def close(self):
+        """Release the file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        try:
+            self.close()
+        except OSError:
+            pass
+
+
+class CpuStatReader:
+    """Total and per-core CPU usage from /proc/stat (same maths as psutil)."""
+
+    def __init__(self, path: str = "/proc/stat"):
+        # cpu lines come first; the huge intr line after them is never needed
+        size = 4096 + 128 * (os.cpu_count() or 1)
+        self._file = ProcFile(path, size=size, grow=False)
+        self._last: List[Tuple[int, int]] = []
+
+    def sample(self) -> Tuple[float, List[float]]:
+        """Return (total %, per-core %) since the previous call."""
+        buf = self._file.read()
+        end = self._file.length
+
+        times: List[Tuple[int, int]] = []
+        start = 0
+        while start < end and buf.startswith(b"cpu", start):
+            stop = buf.find(b"\n", start, end)
+            if stop < 0:
+                break
+            # user nice system idle iowait irq softirq steal guest guest_nice
+            fields = [int(f) for f in buf[start:stop].split()[1:]]
+            total = sum(fields[:8])  # guest time is already part of user/nice
+            idle = fields[3] + fields[4]
+            times.append((total - idle, total))
+            start = stop + 1
+
+        last = self._last if len(self._last) == len(times) else times
+        self._last = times
+
+        percents = []
+        for (busy, total), (last_busy, last_total) in zip(times, last):
+            total_delta = total - last_total
+            percents.append(
+                round(max(0.0, min(100.0, (busy - last_busy) / total_delta * 100)), 1)
+                if total_delta > 0
+                else 0.0
+            )
+        if not percents:
+            return 0.0, []
+        return percents[0], percents[1:]
+
+
+class MemInfoReader:
+    """RAM totals from /proc/meminfo (same definitions as psutil)."""
+
+    _FIELDS = (
+        b"MemTotal",
+        b"MemFree",
+        b"MemAvailable",
+        b"Buffers",
+        b"Cached",
+        b"SReclaimable",
+    )
+
+    def __init__(self, path: str = "/proc/meminfo"):
+        self._file = ProcFile(path)
+
+    def sample(self) -> Tuple[float, int, int, int]:
+        """Return (percent, used, total, available), sizes in bytes."""
+        buf = self._file.read()
+        end = self._file.length
+
+        values = {}
+        start = 0
+        while start < end and len(values) < len(self._FIELDS):
+            stop = buf.find(b"\n", start, end)
+            if stop < 0:
+                stop = end
+            colon = buf.find(b":", start, stop)
+            if colon > 0:
+                key = bytes(buf[start:colon])
+                if key in self._FIELDS:
+                    values[key] = int(buf[colon + 1 : stop].split()[0]) * 1024
+            start = stop + 1
+
+        total = values.get(b"MemTotal", 0)
+        free = values.get(b"MemFree", 0)
+        available = values.get(b"MemAvailable", free)
+        cached = values.get(b"Cached", 0) + values.get(b"SReclaimable", 0)
+        used = total - free - cached - values.get(b"Buffers", 0)
+        if used < 0:
+            used = total - free
+
+        percent = round((total - available) / total * 100, 1) if total else 0.0
+        return percent, used, total, available
+
+
+class NetDevReader:
+    """Received/sent byte totals over all interfaces from /proc/net/dev."""
+
+    def __init__(self, path: str = "/proc/net/dev"):
+        self._file = ProcFile(path, size=8192)
+
+    def sample(self) -> Tuple[int, int]:
+        """Return (bytes received, bytes sent) summed over every interface."""
+        buf = self._file.read()
+        end = self._file.length
+
+        recv = sent = 0
+        # skip the two header lines
+        start = buf.find(b"\n", buf.find(b"\n", 0, end) + 1, end) + 1
+        while 0 < start < end:
+            stop = buf.find(b"\n", start, end)
+            if stop < 0:
+                stop = end
+            colon = buf.find(b":", start, stop)
+            if colon > 0:
+                fields = buf[colon + 1 : stop].split()
+                recv += int(fields[0])
+                sent += int(fields[8])
+            start = stop + 1
+        return recv, sent
+
+
+def find_hwmon(name: str, root: str = "/sys/class/hwmon") -> Optional[str]:
+    """Return the hwmon directory whose ``name`` attribute matches *name*."""
+    try:
+        entries = sorted(os.listdir(root))
+    except OSError:
+        return None
+    for entry in entries:
+        path = os.path.join(root, entry)
+        try:
+            with open(os.path.join(path, "name"), "r", encoding="utf-8") as f:
+                if f.read().strip() == name:
+                    return path
+        except OSError:
+            continue
+    return None
+
+
+def open_hwmon_input(chip: str, attribute: str) -> Optional[ProcFile]:
+    """Open ``<hwmon chip>/<attribute>`` (e.g. coretemp/temp1_input), or None."""
+    path = find_hwmon(chip)
+    if path is None:
+        return None
+    try:
+        return ProcFile(os.path.join(path, attribute), size=32, grow=False)
+    except OSError:
+        return None
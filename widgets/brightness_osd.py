@@ -7,6 +7,7 @@ from fabric.utils import remove_handler
 from custom_widgets.animated_scale import AnimatedScale
 from fabric.widgets.wayland import WaylandWindow as Window  # <--- Add this!
 from services.brightnessservice import BrightnessService
+from services.monitor_registry import MonitorRegistry
 from utils.monitor import get_monitor_info
 from custom_widgets.HackedStackRevealer import HackedRevealer as Revealer
 
@@ -18,6 +19,7 @@ class BrightnessOSD(Window):
 
     def __init__(self, monitor_id=0, **kwargs):
         # Determine if this OSD is internal or external
+        self.monitor_id = monitor_id
         self.device_type, self.hardware_id = get_monitor_info(monitor_id)
 
         super().__init__(
@@ -65,8 +67,14 @@ class BrightnessOSD(Window):
         self.is_closing = False
 
         self.service.connect("changed", self._on_brightness_changed)
+        # the registry may only learn about our monitor after construction
+        self._registry = MonitorRegistry()
+        self._registry.connect("changed", self._on_monitors_changed)
         self.hide()
 
+    def _on_monitors_changed(self, *_):
+        self.device_type, self.hardware_id = get_monitor_info(self.monitor_id)
+
     def _on_brightness_changed(self, _, dev_type, dev_id, value):
         # Match against our dynamic detection
         # Convert both to strings to avoid "1" vs 1 mismatch
@@ -58,7 +58,7 @@ class TopBar(Window):
 
 
         self.mpris = Mpris(window=self)
-        self.cava = CavaWidget()
+        self.cava = CavaWidget(playerctl_service=app_data.playerctl_service)
         self.active_window = WindowName()
         self.workspaces = CustomWorkspaces()
         center_box = Box(